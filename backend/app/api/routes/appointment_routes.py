@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+
+from app.db.database import get_async_db
+from app.schemas.appointment_schemas import (
+    AvailabilityRequest,
+    AppointmentSlot,
+    AppointmentBookingRequest,
+    AppointmentResponse,
+)
+from app.services.auth_services import get_authenticated_user
+import app.services.appointment_services as appointment_services
+
+router = APIRouter()
+
+
+@router.get("/appointments/slots", response_model=List[AppointmentSlot])
+async def search_slots_route(
+    specialization: Optional[str] = None,
+    location: Optional[str] = None,
+    after: Optional[datetime] = None,
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_authenticated_user),
+):
+    """Earliest free slot per matching doctor, soonest first."""
+    if after is not None and after.tzinfo is None:
+        after = after.replace(tzinfo=timezone.utc)
+    return await appointment_services.search_slots_service(db, specialization, location, after, limit)
+
+
+@router.post("/appointments", status_code=status.HTTP_201_CREATED, response_model=AppointmentResponse)
+async def book_appointment_route(
+    payload: AppointmentBookingRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_authenticated_user),
+):
+    return await appointment_services.book_appointment_service(db, payload, current_user)
+
+
+@router.put("/appointments/availability")
+async def set_availability_route(
+    payload: AvailabilityRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_authenticated_user),
+):
+    saved = await appointment_services.set_availability_service(db, payload.windows, current_user)
+    return {"status": 200, "message": "Availability updated", "windows": saved}
@@ -1,10 +1,13 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from typing import List
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
-from app.db.database import get_db
+from app.db.database import get_async_db, AsyncSessionLocal
 from app.models.auth_models import Role, User
 from app.schemas.auth_schemas import (
     UserRegistrationRequest,
@@ -13,27 +16,39 @@ from app.schemas.auth_schemas import (
 )
 
 import app.services.auth_services as auth_services
+import app.services.user_import_services as user_import_services
+import app.services.role_services as role_services
+from app.utils.rate_limit import client_ip
 
 load_dotenv()
 
+# Set when running behind a reverse proxy that sets X-Forwarded-For
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() in ("1", "true", "yes")
+# Number of trusted proxies in front of the app; the client address is that many entries from the right
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1")) if TRUST_PROXY_HEADERS else 0
+
 
 router = APIRouter()
 
 
 # Roles
 @router.get("/roles", response_model=List[RoleResponse])
-def get_roles(db: Session = Depends(get_db)):
-    roles = db.query(Role).all()
+async def get_roles(request: Request, db: AsyncSession = Depends(get_async_db)):
+    roles, body, etag = await role_services.get_cached_roles(db)
     if not roles:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No roles found"
         )
-    return roles
+
+    headers = {"ETag": etag, "Cache-Control": role_services.ROLES_CACHE_CONTROL}
+    if role_services.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 
 @router.post("/auth/register/")
-async def auth_register_route( payload: UserRegistrationRequest, db: Session = Depends(get_db)):
+async def auth_register_route( payload: UserRegistrationRequest, db: AsyncSession = Depends(get_async_db)):
     try:
         result = await auth_services.auth_register_service(payload, db)
         return result
@@ -51,9 +66,10 @@ async def auth_register_route( payload: UserRegistrationRequest, db: Session = D
 
 
 @router.post("/auth/login")
-async def auth_login_routes(payload: LoginRequest, db: Session = Depends(get_db)):
+async def auth_login_routes(payload: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = await auth_services.auth_login_service(payload, db)
+        ip = client_ip(request, trusted_hops=TRUSTED_PROXY_HOPS)
+        result = await auth_services.auth_login_service(payload, db, client_ip=ip)
         return result
     
     except HTTPException as e:
@@ -68,3 +84,27 @@ async def auth_login_routes(payload: LoginRequest, db: Session = Depends(get_db)
 
 
 
+@router.post("/auth/register/bulk")
+async def auth_bulk_register_route(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    current_user: Dict = Depends(auth_services.get_admin_user),
+):
+    """Admin-only bulk onboarding from CSV or JSONL; streams one NDJSON result per row."""
+
+    fmt = (format or user_import_services.detect_import_format(file.filename or "")).lower()
+    if fmt not in user_import_services.SUPPORTED_IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported import format '{fmt}'")
+
+    try:
+        rows = user_import_services.parse_import_bytes(await file.read(), fmt)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+
+    async def stream_results():
+        # Own session: request-scoped dependencies are closed before the body streams
+        async with AsyncSessionLocal() as db:
+            async for outcome in user_import_services.import_users_service(db, rows):
+                yield json.dumps(outcome) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
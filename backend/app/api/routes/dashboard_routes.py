@@ -1,25 +1,69 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+import json
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Request, WebSocket, WebSocketDisconnect, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
 from datetime import timedelta
 
-from app.db.database import get_db
+from app.db.database import get_async_db, AsyncSessionLocal
 from app.models.auth_models import User
 from app.services.auth_services import get_authenticated_user
 import app.services.dashboard_services as dashboard_services
+import app.services.realtime_services as realtime_services
 
 router = APIRouter()
 
 @router.get("/dashboard")
-async def role_based_dashboard_routes(db: Session = Depends(get_db), current_user: User = Depends(get_authenticated_user)):
+async def role_based_dashboard_routes(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_authenticated_user)):
     try:
         result = await dashboard_services.role_based_dashboard_service(db, current_user)
         return result
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, details=f"Failed to fecth dashboar data")
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
 
 
+async def _wait_for_disconnect(websocket: WebSocket, subscription) -> None:
+    # Clients don't need to send anything; reading is how we notice they left
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
 
+@router.websocket("/ws/dashboard")
+async def dashboard_socket_route(websocket: WebSocket, token: str = Query(...)):
+    """Authenticate once, send the dashboard snapshot, then push alerts and vitals for followed patients."""
+    async with AsyncSessionLocal() as db:
+        try:
+            current_user = await get_authenticated_user(token, db)
+            topics = await realtime_services.topics_for_user(db, current_user)
+            snapshot = await dashboard_services.role_based_dashboard_service(db, current_user)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    if topics is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="No live feed for this role")
+        return
 
+    await websocket.accept()
+    subscription = realtime_services.dashboard_hub.subscribe(topics)
+    watcher = asyncio.create_task(_wait_for_disconnect(websocket, subscription))
+    try:
+        await websocket.send_text(json.dumps({"type": "dashboard", **snapshot}, default=str))
+        while True:
+            message = await subscription.get()
+            if message is None:
+                break
+            await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        realtime_services.dashboard_hub.unsubscribe(subscription)
+        watcher.cancel()
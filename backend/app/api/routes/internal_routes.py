@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+
+from app.db.database import pool_stats
+from app.utils.security import hash_pool_stats
+from app.services.auth_services import authenticated_user_cache, get_admin_user
+from app.utils.jwt_token import verified_token_cache
+from app.services.vitals_services import vitals_buffer
+from app.services.vitals_storage_services import vitals_rollup_job
+from app.services.alert_services import alert_writer
+from app.services.realtime_services import dashboard_hub
+from app.services.dispatch_services import order_dispatcher
+
+# Operational stats only: every endpoint requires an admin token
+router = APIRouter(dependencies=[Depends(get_admin_user)])
+
+
+# Password hashing pool stats (queue wait vs. bcrypt time)
+@router.get("/internal/hashing")
+def get_hashing_stats():
+    return hash_pool_stats()
+
+
+# Database connection pool stats (checked-out, overflow, checkout wait)
+@router.get("/internal/pool")
+def get_pool_stats():
+    return pool_stats()
+
+
+# In-process cache hit/miss counters
+@router.get("/internal/cache")
+def get_cache_stats():
+    return {
+        "authenticated_users": authenticated_user_cache.stats(),
+        "verified_tokens": verified_token_cache.stats(),
+    }
+
+
+# Vitals ingestion buffer depth and flush timings
+@router.get("/internal/vitals")
+def get_vitals_ingest_stats():
+    return {**vitals_buffer.stats(), "rollup": vitals_rollup_job.stats(), "alerts": alert_writer.stats()}
+
+
+@router.get("/internal/pubsub")
+def get_pubsub_stats():
+    return dashboard_hub.stats()
+
+
+# Order dispatcher: last batch outcome and run timings
+@router.get("/internal/dispatch")
+def get_dispatch_stats():
+    return order_dispatcher.stats()
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict
+
+from app.db.database import get_async_db
+from app.schemas.order_schemas import MedicineOrderRequest, MedicineOrderResponse
+from app.services.auth_services import get_authenticated_user
+import app.services.dispatch_services as dispatch_services
+
+router = APIRouter()
+
+
+@router.post("/orders", status_code=status.HTTP_201_CREATED, response_model=MedicineOrderResponse)
+async def create_order_route(
+    payload: MedicineOrderRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_authenticated_user),
+):
+    """New orders stay pending until the dispatcher assigns a driver (every DISPATCH_INTERVAL_SECONDS)."""
+    return await dispatch_services.create_order_service(db, payload, current_user)
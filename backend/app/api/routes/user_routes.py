@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+
+from app.db.database import get_async_db
+from app.services.auth_services import get_admin_user
+import app.services.user_services as user_services
+
+router = APIRouter()
+
+
+@router.get("/users")
+async def list_users_route(
+    after_id: int = Query(0, ge=0, description="Return users with id greater than this (next_after_id of the previous page)"),
+    limit: int = Query(50, ge=1, le=user_services.USER_LIST_MAX_LIMIT),
+    role_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    specialization: Optional[str] = None,
+    location: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_admin_user),
+):
+    """Admin-only user listing with seek pagination on id."""
+    return await user_services.list_users_service(
+        db,
+        user_services.parse_user_fields(fields),
+        after_id=after_id,
+        limit=limit,
+        role_id=role_id,
+        is_active=is_active,
+        specialization=specialization,
+        location=location,
+    )
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+
+from app.db.database import get_async_db
+
+from app.schemas.vitals_schemas import VitalReading, VitalsBatchRequest, VitalsIngestResponse
+from app.services.auth_services import get_authenticated_user
+import app.services.vitals_services as vitals_services
+import app.services.vitals_storage_services as vitals_storage_services
+
+router = APIRouter()
+
+# Readings validated per buffer submission while reading an NDJSON stream
+STREAM_SUBMIT_CHUNK = 1000
+MAX_REPORTED_ERRORS = 20
+# Longest NDJSON line buffered while waiting for its newline; a reading is well under 1 KiB
+MAX_STREAM_LINE_BYTES = 64 * 1024
+
+
+@router.post("/vitals/batch", status_code=status.HTTP_202_ACCEPTED, response_model=VitalsIngestResponse)
+async def ingest_vitals_batch_route(payload: VitalsBatchRequest, current_user: Dict = Depends(get_authenticated_user)):
+    accepted = vitals_services.ingest_vitals_service(payload.readings, current_user)
+    return {"accepted": accepted}
+
+
+@router.post("/vitals/stream", status_code=status.HTTP_202_ACCEPTED, response_model=VitalsIngestResponse)
+async def ingest_vitals_stream_route(request: Request, current_user: Dict = Depends(get_authenticated_user)):
+    """NDJSON body, one reading per line; invalid lines are skipped and reported."""
+    accepted = rejected = 0
+    errors: List[dict] = []
+    chunk: List[VitalReading] = []
+    line_number = 0
+    pending = b""
+
+    def parse_line(line: bytes):
+        nonlocal rejected
+        if not line.strip():
+            return
+        try:
+            chunk.append(VitalReading.model_validate_json(line))
+        except ValidationError as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": e.errors(include_url=False)})
+
+    def submit_chunk():
+        nonlocal accepted, chunk
+        if not chunk:
+            return
+        try:
+            accepted += vitals_services.ingest_vitals_service(chunk, current_user)
+        except HTTPException as e:
+            # Tell the client how far we got so it can resume after backpressure
+            raise HTTPException(
+                status_code=e.status_code,
+                detail={"message": e.detail, "accepted": accepted},
+                headers=e.headers,
+            )
+        chunk = []
+
+    async for data in request.stream():
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            parse_line(line)
+            if len(chunk) >= STREAM_SUBMIT_CHUNK:
+                submit_chunk()
+        if len(pending) > MAX_STREAM_LINE_BYTES:
+            # Keep the complete lines read so far, then refuse to buffer an unbounded line
+            submit_chunk()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={"message": f"Line {line_number + 1} exceeds {MAX_STREAM_LINE_BYTES} bytes", "accepted": accepted},
+            )
+
+    line_number += 1
+    parse_line(pending)
+    submit_chunk()
+    return {"accepted": accepted, "rejected": rejected, "errors": errors}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    return value if value is None or value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/vitals/{patient_id}")
+async def get_vitals_route(
+    patient_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: int = Query(vitals_storage_services.VITALS_DEFAULT_MAX_POINTS, ge=1, le=vitals_storage_services.VITALS_MAX_QUERY_POINTS),
+    resolution: Optional[str] = Query(None, description="raw, 1m or 1h; picked from the range when omitted"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Dict = Depends(get_authenticated_user),
+):
+    """Readings for one patient, served from the coarsest table that still gives max_points."""
+    vitals_services.check_vitals_reader(patient_id, current_user)
+    return await vitals_storage_services.get_vitals_series(
+        db, patient_id, _as_utc(start), _as_utc(end), max_points=max_points, resolution=resolution
+    )
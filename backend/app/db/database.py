@@ -1,11 +1,16 @@
 
 
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from dotenv import load_dotenv
 from pathlib import Path
 
+from app.utils.metrics import Histogram, record_request_time
+
 # Load environment variables from .env
 env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -21,21 +26,117 @@ DB_PORT = os.getenv("DB_PORT_1")
 if not all([DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT]):
     raise ValueError("❌ One or more required database environment variables are missing.")
 
-# Construct database URL
+# Connection pool settings (per engine, per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE_1", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW_1", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT_1", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE_1", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING_1", "true").lower() in ("1", "true", "yes")
+
+# Construct database URLs (sync psycopg2 for scripts/DDL, asyncpg for request handling)
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Time spent waiting for a pooled connection
+pool_checkout_wait_seconds = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting to check out a pooled connection", ["engine"]
+)
+
+db_query_seconds = Histogram(
+    "db_query_seconds", "Time spent executing one SQL statement (driver round trip)", ["engine"]
+)
+
+
+class _TimedPoolMixin:
+    """Records how long each checkout waits on the pool (including new connects)."""
+    engine_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait_seconds.observe(time.perf_counter() - started, engine=self.engine_label)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
 
 # SQLAlchemy engine and session setup
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, echo=False, poolclass=TimedQueuePool, **POOL_OPTIONS)
 print("✅ Database connected successfully.", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session used by the API routes
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=False, poolclass=TimedAsyncQueuePool, **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+def install_query_timing(target_engine, label: str) -> None:
+    """Time each statement via cursor events and charge it to the current request's "db" bucket."""
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        db_query_seconds.observe(elapsed, engine=label)
+        record_request_time("db", elapsed)
+
+
+install_query_timing(engine, "sync")
+install_query_timing(async_engine.sync_engine, "async")
+
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get DB session
+# Dependency to get DB session (sync, kept for scripts and startup DDL)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency to get async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _pool_status(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+def pool_stats() -> dict:
+    """Pool occupancy for both engines plus checkout wait histograms."""
+    return {
+        "config": POOL_OPTIONS,
+        "sync": _pool_status(engine.pool),
+        "async": _pool_status(async_engine.sync_engine.pool),
+        "checkout_wait_seconds": pool_checkout_wait_seconds.snapshot(),
+    }
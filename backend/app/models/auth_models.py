@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from app.db.database import Base
 from sqlalchemy.types import DateTime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
+# ✅ Role ids as seeded and used by the frontend (Register / Dashboard pages)
+ROLE_ADMIN = 1
+ROLE_DOCTOR = 2
+ROLE_PATIENT = 3
+ROLE_PHARMACY = 4
+ROLE_DELIVERY = 5
+
+
 class Role(Base):
     __tablename__ = "roles"
 
@@ -21,12 +29,14 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, index=True, nullable=False)  
+    # Unique case-insensitively (ix_users_email_lower); stored lower-cased by the schemas
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
 
     # Common fields
     username = Column(String, nullable=True)
-    phone = Column(String, nullable=True)
+    # Unique index ix_users_phone also serves phone logins (at most one row, then filtered on is_active)
+    phone = Column(String, unique=True, index=True, nullable=True)
     location = Column(String, nullable=True)
 
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
@@ -34,11 +44,24 @@ class User(Base):
 
     is_active = Column(Boolean, default=True)
 
-    # Role-specific fields
-    license_number = Column(String, nullable=True)       # doctor
-    specialization = Column(String, nullable=True)       # doctor
-    pharmacy_name = Column(String, nullable=True)        # pharmacy
-    vehicle_number = Column(String, nullable=True)       # delivery
+    # Role-specific fields (unique only among users of that role, see __table_args__)
+    license_number = Column(String, nullable=True)   # doctor
+    specialization = Column(String, nullable=True)   # doctor
+    pharmacy_name = Column(String, nullable=True)    # pharmacy
+    vehicle_number = Column(String, nullable=True)   # delivery
+
+    # Uniqueness and login lookups (email / username / phone)
+    __table_args__ = (
+        Index("ix_users_license_number", license_number, unique=True, postgresql_where=(role_id == ROLE_DOCTOR)),
+        Index("ix_users_pharmacy_name", pharmacy_name, unique=True, postgresql_where=(role_id == ROLE_PHARMACY)),
+        Index("ix_users_vehicle_number", vehicle_number, unique=True, postgresql_where=(role_id == ROLE_DELIVERY)),
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_active_username_lower", func.lower(username), postgresql_where=(is_active == True)),
+        # Admin listing (/api/users): equality filters followed by the keyset column
+        Index("ix_users_role_active_id", role_id, is_active, id),
+        Index("ix_users_specialization_id", func.lower(specialization), id),
+        Index("ix_users_location_id", func.lower(location), id),
+    )
 
 
 
@@ -0,0 +1,99 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, Index, Text, Time
+from app.db.database import Base
+from sqlalchemy.types import DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+
+# Status values shared with the dashboard counter triggers (app/models/dashboard_models.py)
+ALERT_OPEN = "open"
+APPOINTMENT_CANCELLED = "cancelled"
+ORDER_PENDING = "pending"
+ORDER_ASSIGNED = "assigned"
+DELIVERY_IN_FLIGHT_STATUSES = ("assigned", "picked_up", "in_transit")
+
+
+class Alert(Base):
+    __tablename__ = "alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    doctor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Plain reference into the high-volume vitals_records table (no FK constraint)
+    vitals_id = Column(BigInteger, nullable=True, index=True)
+    alert_type = Column(String, nullable=False)
+    status = Column(String, nullable=False, default=ALERT_OPEN, server_default=ALERT_OPEN)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_alerts_doctor_status", doctor_id, status),
+    )
+
+
+class Appointment(Base):
+    __tablename__ = "appointments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    doctor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    scheduled_time = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False, default="scheduled", server_default="scheduled")
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_appointments_doctor_time", doctor_id, scheduled_time),
+    )
+
+
+class DoctorAvailability(Base):
+    """Weekly recurring window in which a doctor takes appointments (local clock time)."""
+    __tablename__ = "doctor_availability"
+
+    id = Column(Integer, primary_key=True, index=True)
+    doctor_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    day_of_week = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+
+class MedicineOrder(Base):
+    __tablename__ = "medicine_orders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, ForeignKey("alerts.id"), nullable=True, index=True)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    pharmacy_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    medicine_name = Column(String, nullable=False)
+    dosage = Column(String, nullable=True)
+    quantity = Column(Integer, nullable=False, default=1)
+    status = Column(String, nullable=False, default=ORDER_PENDING, server_default=ORDER_PENDING)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Dispatcher backoff for orders that could not be placed (no nearby driver, unparseable location)
+    dispatch_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_dispatch_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    deliveries = relationship("Delivery", back_populates="order")
+
+    __table_args__ = (
+        Index("ix_medicine_orders_pharmacy_status", pharmacy_id, status),
+        Index("ix_medicine_orders_status_next_dispatch", status, next_dispatch_at),
+    )
+
+
+class Delivery(Base):
+    __tablename__ = "deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("medicine_orders.id"), nullable=False, index=True)
+    driver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    delivery_status = Column(String, nullable=False, default="assigned", server_default="assigned")
+    eta = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    order = relationship("MedicineOrder", back_populates="deliveries")
+
+    __table_args__ = (
+        Index("ix_deliveries_driver_status", driver_id, delivery_status),
+    )
@@ -0,0 +1,246 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DDL, event, text
+from app.db.database import Base
+
+
+# Scope values: "global" (scope_id 0), "doctor", "patient", "pharmacy", "driver"
+GLOBAL_SCOPE_ID = 0
+
+
+class DashboardCounter(Base):
+    """Running totals (open alerts, pending orders, ...) maintained by triggers on the fact tables."""
+    __tablename__ = "dashboard_counters"
+
+    scope = Column(String, primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    metric = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class DashboardDailyCounter(Base):
+    """Per-day counts (appointments, alerts, ...) used for dashboard trends."""
+    __tablename__ = "dashboard_daily_counters"
+
+    scope = Column(String, primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    metric = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+# ---- Trigger functions: every write to a fact table adjusts the counters in the same transaction ----
+# Each trigger subtracts the OLD row's contribution and adds the NEW row's, so inserts,
+# status changes, reassignments and deletes all stay consistent.
+COUNTER_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION bump_dashboard_counter(p_scope text, p_scope_id integer, p_metric text, p_delta integer)
+RETURNS void AS $$
+BEGIN
+    IF p_scope_id IS NULL THEN RETURN; END IF;
+    INSERT INTO dashboard_counters (scope, scope_id, metric, value)
+    VALUES (p_scope, p_scope_id, p_metric, p_delta)
+    ON CONFLICT (scope, scope_id, metric) DO UPDATE SET value = dashboard_counters.value + EXCLUDED.value;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_dashboard_daily_counter(p_scope text, p_scope_id integer, p_metric text, p_day date, p_delta integer)
+RETURNS void AS $$
+BEGIN
+    IF p_scope_id IS NULL OR p_day IS NULL THEN RETURN; END IF;
+    INSERT INTO dashboard_daily_counters (scope, scope_id, metric, day, value)
+    VALUES (p_scope, p_scope_id, p_metric, p_day, p_delta)
+    ON CONFLICT (scope, scope_id, metric, day) DO UPDATE SET value = dashboard_daily_counters.value + EXCLUDED.value;
+END $$ LANGUAGE plpgsql;
+"""
+
+ALERTS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION dashboard_track_alerts() RETURNS trigger AS $$
+DECLARE
+    rec alerts;
+    delta integer;
+BEGIN
+    FOREACH delta IN ARRAY ARRAY[-1, 1] LOOP
+        IF delta = -1 THEN
+            IF TG_OP = 'INSERT' THEN CONTINUE; END IF;
+            rec := OLD;
+        ELSE
+            IF TG_OP = 'DELETE' THEN CONTINUE; END IF;
+            rec := NEW;
+        END IF;
+        IF rec.status = 'open' THEN
+            PERFORM bump_dashboard_counter('global', 0, 'open_alerts', delta);
+            PERFORM bump_dashboard_counter('doctor', rec.doctor_id, 'open_alerts', delta);
+            PERFORM bump_dashboard_counter('patient', rec.patient_id, 'open_alerts', delta);
+        END IF;
+        PERFORM bump_dashboard_daily_counter('global', 0, 'alerts', (rec.created_at AT TIME ZONE 'UTC')::date, delta);
+        PERFORM bump_dashboard_daily_counter('doctor', rec.doctor_id, 'alerts', (rec.created_at AT TIME ZONE 'UTC')::date, delta);
+    END LOOP;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dashboard_alerts ON alerts;
+CREATE TRIGGER trg_dashboard_alerts AFTER INSERT OR UPDATE OF status, doctor_id, patient_id, created_at OR DELETE ON alerts
+    FOR EACH ROW EXECUTE FUNCTION dashboard_track_alerts();
+"""
+
+APPOINTMENTS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION dashboard_track_appointments() RETURNS trigger AS $$
+DECLARE
+    rec appointments;
+    delta integer;
+    scheduled_day date;
+BEGIN
+    FOREACH delta IN ARRAY ARRAY[-1, 1] LOOP
+        IF delta = -1 THEN
+            IF TG_OP = 'INSERT' THEN CONTINUE; END IF;
+            rec := OLD;
+        ELSE
+            IF TG_OP = 'DELETE' THEN CONTINUE; END IF;
+            rec := NEW;
+        END IF;
+        IF rec.status <> 'cancelled' THEN
+            scheduled_day := (rec.scheduled_time AT TIME ZONE 'UTC')::date;
+            PERFORM bump_dashboard_daily_counter('global', 0, 'appointments', scheduled_day, delta);
+            PERFORM bump_dashboard_daily_counter('doctor', rec.doctor_id, 'appointments', scheduled_day, delta);
+            PERFORM bump_dashboard_daily_counter('patient', rec.patient_id, 'appointments', scheduled_day, delta);
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dashboard_appointments ON appointments;
+CREATE TRIGGER trg_dashboard_appointments AFTER INSERT OR UPDATE OF status, scheduled_time, doctor_id, patient_id OR DELETE ON appointments
+    FOR EACH ROW EXECUTE FUNCTION dashboard_track_appointments();
+"""
+
+ORDERS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION dashboard_track_orders() RETURNS trigger AS $$
+DECLARE
+    rec medicine_orders;
+    delta integer;
+BEGIN
+    FOREACH delta IN ARRAY ARRAY[-1, 1] LOOP
+        IF delta = -1 THEN
+            IF TG_OP = 'INSERT' THEN CONTINUE; END IF;
+            rec := OLD;
+        ELSE
+            IF TG_OP = 'DELETE' THEN CONTINUE; END IF;
+            rec := NEW;
+        END IF;
+        IF rec.status = 'pending' THEN
+            PERFORM bump_dashboard_counter('global', 0, 'pending_orders', delta);
+            PERFORM bump_dashboard_counter('pharmacy', rec.pharmacy_id, 'pending_orders', delta);
+        END IF;
+        PERFORM bump_dashboard_daily_counter('global', 0, 'orders', (rec.created_at AT TIME ZONE 'UTC')::date, delta);
+        PERFORM bump_dashboard_daily_counter('pharmacy', rec.pharmacy_id, 'orders', (rec.created_at AT TIME ZONE 'UTC')::date, delta);
+    END LOOP;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dashboard_orders ON medicine_orders;
+CREATE TRIGGER trg_dashboard_orders AFTER INSERT OR UPDATE OF status, pharmacy_id, created_at OR DELETE ON medicine_orders
+    FOR EACH ROW EXECUTE FUNCTION dashboard_track_orders();
+"""
+
+DELIVERIES_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION dashboard_track_deliveries() RETURNS trigger AS $$
+DECLARE
+    rec deliveries;
+    delta integer;
+BEGIN
+    FOREACH delta IN ARRAY ARRAY[-1, 1] LOOP
+        IF delta = -1 THEN
+            IF TG_OP = 'INSERT' THEN CONTINUE; END IF;
+            rec := OLD;
+        ELSE
+            IF TG_OP = 'DELETE' THEN CONTINUE; END IF;
+            rec := NEW;
+        END IF;
+        IF rec.delivery_status IN ('assigned', 'picked_up', 'in_transit') THEN
+            PERFORM bump_dashboard_counter('global', 0, 'deliveries_in_flight', delta);
+            PERFORM bump_dashboard_counter('driver', rec.driver_id, 'deliveries_in_flight', delta);
+        END IF;
+        PERFORM bump_dashboard_daily_counter('global', 0, 'deliveries_completed', (rec.completed_at AT TIME ZONE 'UTC')::date, delta);
+        PERFORM bump_dashboard_daily_counter('driver', rec.driver_id, 'deliveries_completed', (rec.completed_at AT TIME ZONE 'UTC')::date, delta);
+    END LOOP;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dashboard_deliveries ON deliveries;
+CREATE TRIGGER trg_dashboard_deliveries AFTER INSERT OR UPDATE OF delivery_status, driver_id, completed_at OR DELETE ON deliveries
+    FOR EACH ROW EXECUTE FUNCTION dashboard_track_deliveries();
+"""
+
+
+@event.listens_for(Base.metadata, "after_create")
+def install_dashboard_triggers(target, connection, tables=(), **kw):
+    """Install (idempotently) the counter triggers after create_all, backfilling on first install."""
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in (
+        COUNTER_FUNCTIONS_SQL,
+        ALERTS_TRIGGER_SQL,
+        APPOINTMENTS_TRIGGER_SQL,
+        ORDERS_TRIGGER_SQL,
+        DELIVERIES_TRIGGER_SQL,
+    ):
+        connection.execute(DDL(statement))
+
+    created = {table.name for table in tables}
+    if DashboardCounter.__tablename__ in created:
+        rebuild_dashboard_counters(connection)
+
+
+def rebuild_dashboard_counters(connection) -> None:
+    """Recompute all counters from the fact tables (scans them; for installs and repairs only)."""
+    connection.execute(text("TRUNCATE dashboard_counters, dashboard_daily_counters"))
+    connection.execute(text("""
+        INSERT INTO dashboard_counters (scope, scope_id, metric, value)
+        SELECT 'global', 0, 'open_alerts', count(*) FROM alerts WHERE status = 'open'
+        UNION ALL
+        SELECT 'doctor', doctor_id, 'open_alerts', count(*) FROM alerts
+            WHERE status = 'open' AND doctor_id IS NOT NULL GROUP BY doctor_id
+        UNION ALL
+        SELECT 'patient', patient_id, 'open_alerts', count(*) FROM alerts
+            WHERE status = 'open' GROUP BY patient_id
+        UNION ALL
+        SELECT 'global', 0, 'pending_orders', count(*) FROM medicine_orders WHERE status = 'pending'
+        UNION ALL
+        SELECT 'pharmacy', pharmacy_id, 'pending_orders', count(*) FROM medicine_orders
+            WHERE status = 'pending' AND pharmacy_id IS NOT NULL GROUP BY pharmacy_id
+        UNION ALL
+        SELECT 'global', 0, 'deliveries_in_flight', count(*) FROM deliveries
+            WHERE delivery_status IN ('assigned', 'picked_up', 'in_transit')
+        UNION ALL
+        SELECT 'driver', driver_id, 'deliveries_in_flight', count(*) FROM deliveries
+            WHERE delivery_status IN ('assigned', 'picked_up', 'in_transit') GROUP BY driver_id
+    """))
+    connection.execute(text("""
+        INSERT INTO dashboard_daily_counters (scope, scope_id, metric, day, value)
+        SELECT scope, scope_id, metric, day, count(*) FROM (
+            SELECT 'global' AS scope, 0 AS scope_id, 'appointments' AS metric,
+                   (scheduled_time AT TIME ZONE 'UTC')::date AS day
+                FROM appointments WHERE status <> 'cancelled'
+            UNION ALL
+            SELECT 'doctor', doctor_id, 'appointments', (scheduled_time AT TIME ZONE 'UTC')::date
+                FROM appointments WHERE status <> 'cancelled'
+            UNION ALL
+            SELECT 'patient', patient_id, 'appointments', (scheduled_time AT TIME ZONE 'UTC')::date
+                FROM appointments WHERE status <> 'cancelled'
+            UNION ALL
+            SELECT 'global', 0, 'alerts', (created_at AT TIME ZONE 'UTC')::date FROM alerts
+            UNION ALL
+            SELECT 'doctor', doctor_id, 'alerts', (created_at AT TIME ZONE 'UTC')::date
+                FROM alerts WHERE doctor_id IS NOT NULL
+            UNION ALL
+            SELECT 'global', 0, 'orders', (created_at AT TIME ZONE 'UTC')::date FROM medicine_orders
+            UNION ALL
+            SELECT 'pharmacy', pharmacy_id, 'orders', (created_at AT TIME ZONE 'UTC')::date
+                FROM medicine_orders WHERE pharmacy_id IS NOT NULL
+            UNION ALL
+            SELECT 'global', 0, 'deliveries_completed', (completed_at AT TIME ZONE 'UTC')::date
+                FROM deliveries WHERE completed_at IS NOT NULL
+            UNION ALL
+            SELECT 'driver', driver_id, 'deliveries_completed', (completed_at AT TIME ZONE 'UTC')::date
+                FROM deliveries WHERE completed_at IS NOT NULL
+        ) AS facts
+        WHERE day IS NOT NULL
+        GROUP BY scope, scope_id, metric, day
+    """))
@@ -0,0 +1,116 @@
+import os
+from datetime import date, datetime, UTC
+from typing import List, Optional
+
+from sqlalchemy import Column, Integer, BigInteger, Float, ForeignKey, Index, event, text
+from app.db.database import Base
+from sqlalchemy.types import DateTime
+from sqlalchemy.sql import func
+
+# Monthly partitions kept around "now"; anything outside lands in the DEFAULT partition
+VITALS_PARTITION_MONTHS_BACK = int(os.getenv("VITALS_PARTITION_MONTHS_BACK", "3"))
+VITALS_PARTITION_MONTHS_AHEAD = int(os.getenv("VITALS_PARTITION_MONTHS_AHEAD", "2"))
+
+
+class VitalsRecord(Base):
+    """Raw readings, range-partitioned by month on recorded_at (see create_vitals_partitions)."""
+    __tablename__ = "vitals_records"
+
+    # Partition key must be part of the primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    recorded_at = Column(DateTime(timezone=True), primary_key=True)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    heart_rate = Column(Integer, nullable=True)
+    spo2 = Column(Float, nullable=True)
+    temperature = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_vitals_records_patient_time", patient_id, recorded_at),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+
+# Column order used by the ingestion COPY, after the id reserved from the sequence
+VITALS_COPY_COLUMNS = ("patient_id", "heart_rate", "spo2", "temperature", "recorded_at")
+
+
+# ---- Rollups: per patient and bucket; sums + counts so averages can be re-aggregated ----
+class VitalsRollupMixin:
+    patient_id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+
+    hr_count = Column(Integer, nullable=False, default=0)
+    hr_min = Column(Integer, nullable=True)
+    hr_max = Column(Integer, nullable=True)
+    hr_sum = Column(BigInteger, nullable=True)
+
+    spo2_count = Column(Integer, nullable=False, default=0)
+    spo2_min = Column(Float, nullable=True)
+    spo2_max = Column(Float, nullable=True)
+    spo2_sum = Column(Float, nullable=True)
+
+    temp_count = Column(Integer, nullable=False, default=0)
+    temp_min = Column(Float, nullable=True)
+    temp_max = Column(Float, nullable=True)
+    temp_sum = Column(Float, nullable=True)
+
+
+class VitalsRollup1m(VitalsRollupMixin, Base):
+    __tablename__ = "vitals_rollup_1m"
+
+
+class VitalsRollup1h(VitalsRollupMixin, Base):
+    __tablename__ = "vitals_rollup_1h"
+
+
+# ---- Per-patient alert thresholds; NULL columns fall back to the env defaults ----
+class VitalsThreshold(Base):
+    __tablename__ = "vitals_thresholds"
+
+    patient_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    spo2_min = Column(Float, nullable=True)
+    hr_max = Column(Integer, nullable=True)
+    hr_sustained_seconds = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# ---- Partition management ----
+def _month_start(day: date, offset: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def vitals_partition_ddl(today: Optional[date] = None) -> List[str]:
+    """CREATE statements (idempotent) for the default partition and the monthly window around today."""
+    today = today or datetime.now(UTC).date()
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {VitalsRecord.__tablename__}_default "
+        f"PARTITION OF {VitalsRecord.__tablename__} DEFAULT"
+    ]
+    for offset in range(-VITALS_PARTITION_MONTHS_BACK, VITALS_PARTITION_MONTHS_AHEAD + 1):
+        start, end = _month_start(today, offset), _month_start(today, offset + 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {VitalsRecord.__tablename__}_p{start:%Y%m} "
+            f"PARTITION OF {VitalsRecord.__tablename__} "
+            f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+        )
+    return statements
+
+
+def create_vitals_partitions(connection, today: Optional[date] = None) -> None:
+    """Create missing partitions; each statement gets its own savepoint so one failure doesn't abort the rest."""
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in vitals_partition_ddl(today):
+        try:
+            with connection.begin_nested():
+                connection.execute(text(statement))
+        except Exception as e:
+            # e.g. the DEFAULT partition already holds rows for this month
+            print("❌ Could not create vitals partition:", str(e))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def ensure_vitals_partitions(target, connection, **kw):
+    # Runs on every create_all (startup); the rollup job re-checks daily for long-lived workers
+    create_vitals_partitions(connection)
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from datetime import datetime, time, timezone
+
+
+# ------------------Schemas for appointment scheduling -----------------------------------------
+class AvailabilityWindow(BaseModel):
+    day_of_week: int = Field(..., ge=0, le=6)  # 0 = Monday
+    start_time: time
+    end_time: time
+
+    @validator('end_time')
+    def end_after_start(cls, v, values):
+        if 'start_time' in values and v <= values['start_time']:
+            raise ValueError("end_time must be after start_time")
+        return v
+
+
+class AvailabilityRequest(BaseModel):
+    """Replaces the doctor's weekly availability."""
+    windows: List[AvailabilityWindow] = Field(..., max_length=100)
+
+
+class AppointmentSlot(BaseModel):
+    doctor_id: int
+    doctor_name: Optional[str] = None
+    specialization: Optional[str] = None
+    location: Optional[str] = None
+    start: datetime
+    end: datetime
+
+
+class AppointmentBookingRequest(BaseModel):
+    doctor_id: int
+    scheduled_time: datetime
+    notes: Optional[str] = None
+
+    @validator('scheduled_time')
+    def assume_utc(cls, v):
+        return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+class AppointmentResponse(BaseModel):
+    id: int
+    patient_id: int
+    doctor_id: int
+    scheduled_time: datetime
+    status: str
+    notes: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -65,6 +65,11 @@ class UserRegistrationRequest(BaseModel):
     pharmacy_name: Optional[str] = None
     vehicle_number: Optional[str] = None
     
+    @validator('email')
+    def normalize_email(cls, v):
+        # Stored lower-cased so login can match on lower(email)
+        return v.lower()
+
     @validator('password')
     def validate_password(cls, v):
         if len(v) < 6:
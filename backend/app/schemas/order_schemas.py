@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+# ------------------Schemas for medicine orders -----------------------------------------
+class MedicineOrderRequest(BaseModel):
+    pharmacy_id: int
+    medicine_name: str = Field(..., min_length=1)
+    dosage: Optional[str] = None
+    quantity: int = Field(1, ge=1, le=1000)
+    patient_id: Optional[int] = None   # required when a doctor orders for a patient
+    alert_id: Optional[int] = None
+
+
+class MedicineOrderResponse(BaseModel):
+    id: int
+    patient_id: Optional[int] = None
+    pharmacy_id: Optional[int] = None
+    medicine_name: str
+    dosage: Optional[str] = None
+    quantity: int
+    status: str
+
+    class Config:
+        from_attributes = True
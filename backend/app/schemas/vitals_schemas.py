@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from datetime import datetime, timezone
+
+
+# ------------------Schemas for vitals ingestion -----------------------------------------
+class VitalReading(BaseModel):
+    """One wearable reading."""
+    patient_id: int
+    heart_rate: Optional[int] = Field(None, ge=0, le=300)
+    spo2: Optional[float] = Field(None, ge=0, le=100)
+    temperature: Optional[float] = Field(None, ge=0, le=120)
+    timestamp: datetime
+
+    @validator('timestamp')
+    def assume_utc(cls, v):
+        # Devices sometimes send naive timestamps; treat them as UTC
+        return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+class VitalsBatchRequest(BaseModel):
+    """Schema for a batch of readings."""
+    readings: List[VitalReading] = Field(..., min_length=1, max_length=10000)
+
+
+class VitalsIngestResponse(BaseModel):
+    accepted: int
+    rejected: int = 0
+    errors: List[dict] = []
@@ -0,0 +1,155 @@
+import os
+import time
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.models.care_models import Alert, Appointment
+from app.models.vitals_models import VitalsThreshold
+from app.services.realtime_services import publish_alerts
+from app.utils.metrics import Counter, Histogram
+from app.utils.vitals_rules import AlertEvent, VitalsRuleEngine, VitalsThresholds
+
+# ✅ Alert writer settings
+ALERT_FLUSH_INTERVAL_SECONDS = float(os.getenv("ALERT_FLUSH_INTERVAL_SECONDS", "1"))
+ALERT_MAX_BUFFERED = int(os.getenv("ALERT_MAX_BUFFERED", "50000"))
+VITALS_THRESHOLD_REFRESH_SECONDS = float(os.getenv("VITALS_THRESHOLD_REFRESH_SECONDS", "60"))
+# Rule state for patients without readings for this long is dropped
+VITALS_RULE_IDLE_SECONDS = float(os.getenv("VITALS_RULE_IDLE_SECONDS", "3600"))
+
+alerts_raised_total = Counter("alerts_raised_total", "Alerts raised by the vitals rule engine", ("alert_type",))
+alerts_dropped_total = Counter("alerts_dropped_total", "Alerts dropped because the writer was full or failed")
+vitals_rules_seconds = Histogram("vitals_rules_seconds", "Time to evaluate one ingestion batch against the rules")
+
+vitals_rule_engine = VitalsRuleEngine()
+
+# An alert plus the id of the vitals_records row that triggered it
+QueuedAlert = Tuple[AlertEvent, Optional[int]]
+
+
+async def load_vitals_thresholds(db: AsyncSession) -> Dict[int, VitalsThresholds]:
+    defaults = vitals_rule_engine.defaults
+    rows = (await db.execute(select(VitalsThreshold))).scalars().all()
+    return {
+        row.patient_id: VitalsThresholds(
+            spo2_min=row.spo2_min if row.spo2_min is not None else defaults.spo2_min,
+            hr_max=row.hr_max if row.hr_max is not None else defaults.hr_max,
+            hr_sustained_seconds=(
+                row.hr_sustained_seconds if row.hr_sustained_seconds is not None
+                else defaults.hr_sustained_seconds
+            ),
+        )
+        for row in rows
+    }
+
+
+async def attending_doctors(db: AsyncSession, patient_ids: List[int]) -> Dict[int, int]:
+    """Doctor of each patient's most recent appointment."""
+    result = await db.execute(
+        select(Appointment.patient_id, Appointment.doctor_id)
+        .where(Appointment.patient_id.in_(patient_ids))
+        .distinct(Appointment.patient_id)
+        .order_by(Appointment.patient_id, Appointment.scheduled_time.desc())
+    )
+    return dict(result.all())
+
+
+# ✅ Buffers alerts from the rule engine and inserts them in batches
+class AlertWriter:
+    def __init__(
+        self,
+        flush_interval: float = ALERT_FLUSH_INTERVAL_SECONDS,
+        max_buffered: int = ALERT_MAX_BUFFERED,
+    ):
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._alerts: List[QueuedAlert] = []
+        self._thresholds_loaded_at = None
+        self._task = None
+        self._running = False
+
+    def submit(self, alerts: List[QueuedAlert]) -> None:
+        room = self.max_buffered - len(self._alerts)
+        if len(alerts) > room:
+            alerts_dropped_total.inc(len(alerts) - max(room, 0))
+            alerts = alerts[:max(room, 0)]
+        self._alerts.extend(alerts)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._running or self._alerts:
+            await asyncio.sleep(self.flush_interval if self._running else 0)
+            try:
+                await self._maintain()
+            except Exception as e:
+                print("❌ Failed to refresh vitals thresholds:", str(e))
+            if self._alerts:
+                batch, self._alerts = self._alerts, []
+                await self._flush(batch)
+
+    async def _maintain(self) -> None:
+        now = time.monotonic()
+        if self._thresholds_loaded_at is None or now - self._thresholds_loaded_at >= VITALS_THRESHOLD_REFRESH_SECONDS:
+            async with AsyncSessionLocal() as db:
+                vitals_rule_engine.set_thresholds(await load_vitals_thresholds(db))
+            vitals_rule_engine.evict_idle(time.time() - VITALS_RULE_IDLE_SECONDS)
+            self._thresholds_loaded_at = now
+
+    async def _flush(self, batch: List[QueuedAlert]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                doctors = await attending_doctors(db, list({event[0] for event, _ in batch}))
+                await db.execute(insert(Alert), [
+                    {
+                        "patient_id": patient_id,
+                        "doctor_id": doctors.get(patient_id),
+                        "vitals_id": vitals_id,
+                        "alert_type": alert_type,
+                    }
+                    for (patient_id, alert_type, _recorded_at, _value), vitals_id in batch
+                ])
+                await db.commit()
+        except Exception as e:
+            print("❌ Failed to write alerts:", str(e))
+            alerts_dropped_total.inc(len(batch))
+
+    def stats(self) -> Dict:
+        return {
+            "buffered": len(self._alerts),
+            "patients_tracked": len(vitals_rule_engine.windows),
+            "patients_with_thresholds": len(vitals_rule_engine.thresholds),
+            "raised": alerts_raised_total.snapshot(),
+            "dropped": alerts_dropped_total.value(),
+            "rules_seconds": vitals_rules_seconds.snapshot(),
+        }
+
+
+alert_writer = AlertWriter()
+
+
+def evaluate_vitals_rows(rows: List, vitals_ids: List[int]) -> List[AlertEvent]:
+    """Run stored ingestion rows (and their vitals_records ids) through the rules and queue any alerts."""
+    started = time.perf_counter()
+    alerts = vitals_rule_engine.evaluate(rows)
+    vitals_rules_seconds.observe(time.perf_counter() - started)
+    for _patient_id, alert_type, _recorded_at, _value in alerts:
+        alerts_raised_total.inc(alert_type=alert_type)
+    if alerts:
+        # Alerts carry (patient_id, recorded_at) of their reading; map that back to the row id
+        row_ids = {(row[0], row[4]): vitals_id for row, vitals_id in zip(rows, vitals_ids)}
+        alert_writer.submit([(alert, row_ids.get((alert[0], alert[2]))) for alert in alerts])
+        publish_alerts(alerts)
+    return alerts
@@ -0,0 +1,248 @@
+import os
+import time
+import asyncio
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta, time as clock_time, UTC
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, delete, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.auth_models import User, ROLE_DOCTOR, ROLE_PATIENT
+from app.models.care_models import Appointment, DoctorAvailability, APPOINTMENT_CANCELLED
+from app.schemas.appointment_schemas import AvailabilityWindow, AppointmentBookingRequest
+
+# ✅ Scheduling settings
+APPOINTMENT_SLOT_MINUTES = int(os.getenv("APPOINTMENT_SLOT_MINUTES", "30"))
+# Availability windows are wall-clock times in this zone
+APPOINTMENT_TIMEZONE = ZoneInfo(os.getenv("APPOINTMENT_TIMEZONE", "Asia/Kolkata"))
+APPOINTMENT_SEARCH_DAYS = int(os.getenv("APPOINTMENT_SEARCH_DAYS", "14"))
+# Bounds staleness from bookings made by other worker processes
+APPOINTMENT_INDEX_TTL_SECONDS = float(os.getenv("APPOINTMENT_INDEX_TTL_SECONDS", "60"))
+
+SLOT_SECONDS = APPOINTMENT_SLOT_MINUTES * 60
+
+
+def _minutes(value: clock_time) -> int:
+    return value.hour * 60 + value.minute
+
+
+# ✅ One doctor's weekly windows plus booked slot starts (epoch seconds, sorted)
+class DoctorSchedule:
+    __slots__ = ("doctor_id", "name", "specialization", "location", "windows", "booked")
+
+    def __init__(self, doctor_id: int, name: Optional[str], specialization: Optional[str], location: Optional[str]):
+        self.doctor_id = doctor_id
+        self.name = name
+        self.specialization = specialization
+        self.location = location
+        # weekday -> sorted [(start_minute, end_minute)]
+        self.windows: Dict[int, List[Tuple[int, int]]] = {}
+        self.booked: List[float] = []
+
+    def is_free(self, start: float) -> bool:
+        # Appointments all have the same length, so an overlap means a booked start within one slot either side
+        i = bisect_right(self.booked, start - SLOT_SECONDS)
+        return i == len(self.booked) or self.booked[i] >= start + SLOT_SECONDS
+
+    def is_slot_start(self, start: datetime) -> bool:
+        local = start.astimezone(APPOINTMENT_TIMEZONE)
+        if local.second or local.microsecond:
+            return False
+        minute = local.hour * 60 + local.minute
+        return any(
+            begin <= minute and minute + APPOINTMENT_SLOT_MINUTES <= end
+            and (minute - begin) % APPOINTMENT_SLOT_MINUTES == 0
+            for begin, end in self.windows.get(local.weekday(), ())
+        )
+
+    def next_free_slot(self, after: datetime, days: int = APPOINTMENT_SEARCH_DAYS) -> Optional[float]:
+        after_ts = after.timestamp()
+        first_day = after.astimezone(APPOINTMENT_TIMEZONE).date()
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            midnight = datetime.combine(day, clock_time(), tzinfo=APPOINTMENT_TIMEZONE)
+            for begin, end in self.windows.get(day.weekday(), ()):
+                for minute in range(begin, end - APPOINTMENT_SLOT_MINUTES + 1, APPOINTMENT_SLOT_MINUTES):
+                    start = (midnight + timedelta(minutes=minute)).timestamp()
+                    if start >= after_ts and self.is_free(start):
+                        return start
+        return None
+
+
+# ✅ In-memory slot index over every doctor with availability; bookings update it in place
+class AppointmentSlotIndex:
+    def __init__(self):
+        self.doctors: Dict[int, DoctorSchedule] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < APPOINTMENT_INDEX_TTL_SECONDS
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+
+    async def load(self, db: AsyncSession) -> None:
+        doctors: Dict[int, DoctorSchedule] = {}
+        result = await db.execute(
+            select(DoctorAvailability, User.username, User.specialization, User.location)
+            .join(User, User.id == DoctorAvailability.doctor_id)
+            .where(DoctorAvailability.is_active == True, User.is_active == True)
+            .order_by(DoctorAvailability.doctor_id, DoctorAvailability.day_of_week, DoctorAvailability.start_time)
+        )
+        for window, name, specialization, location in result.all():
+            schedule = doctors.get(window.doctor_id)
+            if schedule is None:
+                schedule = doctors[window.doctor_id] = DoctorSchedule(window.doctor_id, name, specialization, location)
+            schedule.windows.setdefault(window.day_of_week, []).append(
+                (_minutes(window.start_time), _minutes(window.end_time))
+            )
+
+        if doctors:
+            booked = await db.execute(
+                select(Appointment.doctor_id, Appointment.scheduled_time)
+                .where(
+                    Appointment.doctor_id.in_(list(doctors)),
+                    Appointment.status != APPOINTMENT_CANCELLED,
+                    Appointment.scheduled_time > datetime.now(UTC) - timedelta(seconds=SLOT_SECONDS),
+                )
+                .order_by(Appointment.scheduled_time)
+            )
+            for doctor_id, scheduled_time in booked.all():
+                doctors[doctor_id].booked.append(scheduled_time.timestamp())
+
+        self.doctors = doctors
+        self.loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if not self.is_fresh():
+                await self.load(db)
+
+    def add_booking(self, doctor_id: int, start: datetime) -> None:
+        schedule = self.doctors.get(doctor_id)
+        if schedule is not None:
+            insort(schedule.booked, start.timestamp())
+
+
+slot_index = AppointmentSlotIndex()
+
+
+@event.listens_for(DoctorAvailability, "after_insert")
+@event.listens_for(DoctorAvailability, "after_update")
+@event.listens_for(DoctorAvailability, "after_delete")
+def _invalidate_slot_index(mapper, connection, target):
+    slot_index.invalidate()
+
+
+# ---- Service: earliest free slots across matching doctors ----
+async def search_slots_service(
+    db: AsyncSession,
+    specialization: Optional[str] = None,
+    location: Optional[str] = None,
+    after: Optional[datetime] = None,
+    limit: int = 5,
+) -> List[Dict]:
+    await slot_index.ensure_loaded(db)
+    after = max(after or datetime.now(UTC), datetime.now(UTC))
+    specialization = (specialization or "").strip().lower()
+    location = (location or "").strip().lower()
+
+    slots = []
+    for schedule in slot_index.doctors.values():
+        if specialization and specialization not in (schedule.specialization or "").lower():
+            continue
+        if location and location not in (schedule.location or "").lower():
+            continue
+        start = schedule.next_free_slot(after)
+        if start is not None:
+            slots.append((start, schedule))
+
+    slots.sort(key=lambda item: item[0])
+    return [
+        {
+            "doctor_id": schedule.doctor_id,
+            "doctor_name": schedule.name,
+            "specialization": schedule.specialization,
+            "location": schedule.location,
+            "start": datetime.fromtimestamp(start, UTC),
+            "end": datetime.fromtimestamp(start + SLOT_SECONDS, UTC),
+        }
+        for start, schedule in slots[:limit]
+    ]
+
+
+# ---- Service: book a slot; the doctor's users row is the lock that serializes bookings ----
+async def book_appointment_service(db: AsyncSession, payload: AppointmentBookingRequest, current_user: Dict) -> Appointment:
+    if current_user.get("role_id") != ROLE_PATIENT:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only patients can book appointments")
+
+    start = payload.scheduled_time
+    if start <= datetime.now(UTC):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Appointment must be in the future")
+
+    await slot_index.ensure_loaded(db)
+    schedule = slot_index.doctors.get(payload.doctor_id)
+    if schedule is None or not schedule.is_slot_start(start):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Doctor is not available at this time")
+
+    try:
+        doctor = (await db.execute(
+            select(User.id).where(User.id == payload.doctor_id, User.role_id == ROLE_DOCTOR, User.is_active == True).with_for_update()
+        )).scalar()
+        if doctor is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found")
+
+        # Authoritative overlap check, done while holding the doctor's row lock
+        slot = timedelta(seconds=SLOT_SECONDS)
+        clash = (await db.execute(
+            select(Appointment.id).where(
+                Appointment.doctor_id == payload.doctor_id,
+                Appointment.status != APPOINTMENT_CANCELLED,
+                Appointment.scheduled_time > start - slot,
+                Appointment.scheduled_time < start + slot,
+            ).limit(1)
+        )).scalar()
+        if clash is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This slot has just been booked")
+
+        appointment = Appointment(
+            patient_id=current_user["id"],
+            doctor_id=payload.doctor_id,
+            scheduled_time=start,
+            notes=payload.notes,
+        )
+        db.add(appointment)
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
+
+    slot_index.add_booking(payload.doctor_id, start)
+    return appointment
+
+
+# ---- Service: doctor replaces their weekly availability ----
+async def set_availability_service(db: AsyncSession, windows: List[AvailabilityWindow], current_user: Dict) -> int:
+    if current_user.get("role_id") != ROLE_DOCTOR:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only doctors can set availability")
+
+    await db.execute(delete(DoctorAvailability).where(DoctorAvailability.doctor_id == current_user["id"]))
+    db.add_all([
+        DoctorAvailability(
+            doctor_id=current_user["id"],
+            day_of_week=window.day_of_week,
+            start_time=window.start_time,
+            end_time=window.end_time,
+        )
+        for window in windows
+    ])
+    await db.commit()
+    # Core delete() bypasses the mapper events
+    slot_index.invalidate()
+    return len(windows)
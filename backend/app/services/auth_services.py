@@ -1,18 +1,23 @@
 import os
+import re
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, or_, select, event, func
+from sqlalchemy.exc import IntegrityError
 from fastapi.security import OAuth2PasswordBearer
-from typing import Dict
+from typing import Dict, List, Optional
 from jose import jwt, JWTError
-from app.utils.security import hash_password, verify_password
-from app.models.auth_models import User, Role
+from app.utils.security import hash_password_async, verify_password_async
+from app.models.auth_models import User, Role, ROLE_ADMIN, ROLE_DOCTOR, ROLE_PHARMACY, ROLE_DELIVERY
 from app.schemas.auth_schemas import UserRegistrationRequest, LoginRequest
 from app.utils.jwt_token import create_access_token, create_refresh_token, decode_jwt_token
+from app.utils.cache import TTLCache
+from app.utils.rate_limit import RateLimiter
 from datetime import timedelta
 
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from dotenv import load_dotenv  # secret key, algorithm
 
 # OAuth2 scheme to read token from Authorization header
@@ -26,49 +31,143 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
 load_dotenv()
 
-async def auth_register_service(payload: UserRegistrationRequest, db: Session):
+# ✅ Authenticated-user cache (user id -> user dict), TTL kept well under the 15 min access token
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+authenticated_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the cache, e.g. after deactivation or a role change."""
+    authenticated_user_cache.invalidate(int(user_id))
+
+
+def invalidate_all_cached_users() -> None:
+    authenticated_user_cache.clear()
+
+
+# ORM updates invalidate automatically; bulk `update()`/`delete()` statements
+# bypass these hooks and must call invalidate_cached_user() explicitly.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target):
+    invalidate_cached_user(target.id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _invalidate_users_on_role_change(mapper, connection, target):
+    invalidate_all_cached_users()
+
+
+# ---- Unique user fields (backed by unique indexes on `users`) ----
+UNIQUE_FIELD_ERRORS: Dict[str, str] = {
+    "email": "Email already exists",
+    "phone": "Phone number already exists",
+    "license_number": "License number already registered",
+    "pharmacy_name": "Pharmacy name already registered",
+    "vehicle_number": "Vehicle number already registered",
+}
+
+
+# Role-specific fields are only unique among users of that role (partial unique indexes)
+UNIQUE_FIELD_ROLES: Dict[str, int] = {
+    "license_number": ROLE_DOCTOR,
+    "pharmacy_name": ROLE_PHARMACY,
+    "vehicle_number": ROLE_DELIVERY,
+}
+
+
+def unique_field_values(payload: UserRegistrationRequest) -> Dict[str, str]:
+    """Unique-constrained fields the payload actually sets (role-specific ones only for that role)."""
+    return {
+        field: getattr(payload, field)
+        for field in UNIQUE_FIELD_ERRORS
+        if getattr(payload, field) and UNIQUE_FIELD_ROLES.get(field, payload.role) == payload.role
+    }
+
+
+def unique_column(field: str):
+    """Expression the field's unique index is on (email is unique case-insensitively)."""
+    return func.lower(User.email) if field == "email" else getattr(User, field)
+
+
+def normalize_unique_value(field: str, value: str) -> str:
+    return value.lower() if field == "email" else value
+
+
+def unique_field_condition(field: str, values):
+    """WHERE clause matching rows that hold one of `values` under the field's unique index."""
+    condition = unique_column(field).in_([normalize_unique_value(field, value) for value in values])
+    if field in UNIQUE_FIELD_ROLES:
+        condition = and_(condition, User.role_id == UNIQUE_FIELD_ROLES[field])
+    return condition
+
+
+def holds_unique_value(field: str, role_id: int) -> bool:
+    """Whether a row with this role counts towards the field's unique index."""
+    return UNIQUE_FIELD_ROLES.get(field, role_id) == role_id
+
+
+async def find_conflicting_fields(db: AsyncSession, values: Dict[str, str]) -> List[str]:
+    """Return which of the given unique fields already exist, in one query."""
+    if not values:
+        return []
+    columns = [unique_column(field) for field in values]
+    rows = (
+        await db.execute(
+            select(User.role_id, *columns).where(
+                or_(*(unique_field_condition(field, [value]) for field, value in values.items()))
+            )
+        )
+    ).all()
+    taken = {
+        field
+        for role_id, *row in rows
+        for field, existing in zip(values, row)
+        if existing == normalize_unique_value(field, values[field]) and holds_unique_value(field, role_id)
+    }
+    return [field for field in values if field in taken]
+
+
+async def auth_register_service(payload: UserRegistrationRequest, db: AsyncSession):
     """
     Register a new user:
-    - Validate unique fields
-    - Hash password & save user
+    - Reject known duplicates with one query before paying for bcrypt
+    - Hash password & insert user
+    - On a unique violation (concurrent sign-up), report which field collided
     - Return user info with access + refresh tokens
     """
 
     try:
-        # ✅ Check unique constraints
-        if db.query(User).filter(User.email == payload.email).first():
-            raise HTTPException(status_code=400, detail="Email already exists")
-        if db.query(User).filter(User.phone == payload.phone).first():
-            raise HTTPException(status_code=400, detail="Phone number already exists")
-
-        if payload.role == 2 and payload.license_number:
-            if db.query(User).filter(User.license_number == payload.license_number).first():
-                raise HTTPException(status_code=400, detail="License number already registered")
+        # ✅ Cheap pre-check so duplicate sign-ups never reach the hashing pool
+        conflicts = await find_conflicting_fields(db, unique_field_values(payload))
+        if conflicts:
+            raise HTTPException(status_code=400, detail=UNIQUE_FIELD_ERRORS[conflicts[0]])
 
-        if payload.role == 4 and payload.pharmacy_name:
-            if db.query(User).filter(User.pharmacy_name == payload.pharmacy_name).first():
-                raise HTTPException(status_code=400, detail="Pharmacy name already registered")
-
-        if payload.role == 5 and payload.vehicle_number:
-            if db.query(User).filter(User.vehicle_number == payload.vehicle_number).first():
-                raise HTTPException(status_code=400, detail="Vehicle number already registered")
-
-        # ✅ Create and save new user
+        # ✅ Create and save new user; unique indexes still reject racing duplicates atomically
         new_user = User(
             email=payload.email,
-            hashed_password=hash_password(payload.password),
+            hashed_password=await hash_password_async(payload.password),
             username=payload.username,
             phone=payload.phone,
             location=payload.location,
             role_id=payload.role,
-            license_number=payload.license_number,
+            # Empty strings would collide on the unique indexes, store NULL instead
+            license_number=payload.license_number or None,
             specialization=payload.specialization,
-            pharmacy_name=payload.pharmacy_name,
-            vehicle_number=payload.vehicle_number,
+            pharmacy_name=payload.pharmacy_name or None,
+            vehicle_number=payload.vehicle_number or None,
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            conflicts = await find_conflicting_fields(db, unique_field_values(payload))
+            if conflicts:
+                raise HTTPException(status_code=400, detail=UNIQUE_FIELD_ERRORS[conflicts[0]])
+            raise
 
         # ✅ Generate tokens
         access_token = create_access_token(
@@ -105,17 +204,71 @@ async def auth_register_service(payload: UserRegistrationRequest, db: Session):
         raise e
     except Exception as e:
         # Worst-case fallback
-        db.rollback()  # rollback to prevent half-commits
+        await db.rollback()  # rollback to prevent half-commits
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            message=f"Registration failed: {str(e)}"
+            detail=f"Registration failed: {str(e)}"
         )
 
 
 # -------------------------Login Service ---------------------------------------------------------------------------
-async def auth_login_service(payload: LoginRequest, db: Session):
+# Login throttling: checked before the user lookup and bcrypt, so bursts never reach the DB or the hash pool
+LOGIN_IP_BURST = float(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "20"))
+LOGIN_IDENTIFIER_BURST = float(os.getenv("LOGIN_IDENTIFIER_BURST", "5"))
+LOGIN_IDENTIFIER_PER_MINUTE = float(os.getenv("LOGIN_IDENTIFIER_PER_MINUTE", "2"))
+login_ip_limiter = RateLimiter("login_ip", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE)
+login_identifier_limiter = RateLimiter("login_identifier", LOGIN_IDENTIFIER_BURST, LOGIN_IDENTIFIER_PER_MINUTE)
+
+PHONE_IDENTIFIER_RE = re.compile(r"^\+?[\d\s\-()]{10,}$")
+
+
+def classify_login_identifier(identifier: str) -> str:
+    """Decide which column a login identifier refers to: email, phone or username."""
+    if "@" in identifier:
+        return "email"
+    if PHONE_IDENTIFIER_RE.match(identifier):
+        return "phone"
+    return "username"
+
+
+def _active_user_query(condition, limit: int = 1):
+    return select(User).where(condition, User.is_active == True).limit(limit)
+
+
+async def find_active_user_by_identifier(db: AsyncSession, identifier: str):
+    """
+    Look the user up on a single indexed column (partial indexes on active users):
+    - email / username are matched case-insensitively via lower()
+    - phone-looking identifiers fall back to username, since usernames may be numeric
+    - usernames are not unique, so one shared by several active accounts is rejected
+    """
+    kind = classify_login_identifier(identifier)
+    if kind == "email":
+        return (await db.execute(
+            _active_user_query(func.lower(User.email) == identifier.lower())
+        )).scalars().first()
+
+    if kind == "phone":
+        user = (await db.execute(_active_user_query(User.phone == identifier))).scalars().first()
+        if user:
+            return user
+
+    users = (await db.execute(
+        _active_user_query(func.lower(User.username) == identifier.lower(), limit=2)
+    )).scalars().all()
+    if len(users) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This username belongs to more than one account, please log in with your email or phone",
+        )
+    return users[0] if users else None
+
+
+async def auth_login_service(payload: LoginRequest, db: AsyncSession, client_ip: Optional[str] = None):
     """
     Login a user:
+    - Throttle per client IP and per identifier (429 with Retry-After)
     - Validate identifiers (email, username, or phone)
     - Verify password
     - Return user info with access + refresh tokens
@@ -124,15 +277,13 @@ async def auth_login_service(payload: LoginRequest, db: Session):
         identifier = payload.identifier.strip()
         password = payload.password
 
+        # 🚦 Throttle before touching the DB or bcrypt
+        if client_ip:
+            await login_ip_limiter.hit(client_ip, detail="Too many login attempts, please retry later")
+        await login_identifier_limiter.hit(identifier.lower(), detail="Too many login attempts for this account, please retry later")
+
         # 🔍 Check if user exists by email, username, or phone
-        user = db.query(User).filter(
-            or_(
-                User.email == identifier,
-                User.username == identifier,
-                User.phone == identifier
-            ),
-            User.is_active == True
-        ).first()
+        user = await find_active_user_by_identifier(db, identifier)
 
 
         if not user:
@@ -141,14 +292,17 @@ async def auth_login_service(payload: LoginRequest, db: Session):
                 detail="Invalid credentials. User not found."
             )
         
-        # 🔑 Verify password
-        if not verify_password(password, user.hashed_password):
+        # 🔑 Verify password (off the event loop)
+        if not await verify_password_async(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials. Incorrect password."
             )
        
 
+        # Successful login forgives earlier typos for this identifier
+        await login_identifier_limiter.reset(identifier.lower())
+
         # 🎟️ Generate tokens
         access_token = create_access_token(
             username=user.email,
@@ -189,7 +343,7 @@ async def auth_login_service(payload: LoginRequest, db: Session):
 
 
 # --------------- get current  authenticated user details and Decode token and return user ------------------------------------
-def get_authenticated_user( token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Dict:
+async def get_authenticated_user( token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Dict:
     try:
         # 🔹 Decode token
         payload = decode_jwt_token(token)
@@ -207,13 +361,19 @@ def get_authenticated_user( token: str = Depends(oauth2_scheme), db: Session = D
                 detail="Token payload invalid",
             )
 
+        # 🔹 Serve from cache when possible
+        cached_user = authenticated_user_cache.get(int(user_id))
+        if cached_user is not None:
+            return dict(cached_user)
+
         # 🔹 Fetch user with role in one go
         user = (
-            db.query(User)
-            .options(joinedload(User.role))
-            .filter(User.id == int(user_id), User.is_active == True)
-            .first()
-        )
+            await db.execute(
+                select(User)
+                .options(joinedload(User.role))
+                .where(User.id == int(user_id), User.is_active == True)
+            )
+        ).scalars().first()
 
         if not user:
             raise HTTPException(
@@ -222,7 +382,7 @@ def get_authenticated_user( token: str = Depends(oauth2_scheme), db: Session = D
             )
 
         # 🔹 Return user data
-        return {
+        user_data = {
             "id": user.id,
             "username": user.username,
             "email": user.email,
@@ -230,6 +390,8 @@ def get_authenticated_user( token: str = Depends(oauth2_scheme), db: Session = D
             "role_id": user.role_id,
             "role_name": user.role.role_name if user.role else None,
         }
+        authenticated_user_cache.set(user.id, user_data)
+        return dict(user_data)
 
     except HTTPException:
         raise  # Re-raise known errors
@@ -239,4 +401,15 @@ def get_authenticated_user( token: str = Depends(oauth2_scheme), db: Session = D
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get current logged in user"
-        )
\ No newline at end of file
+        )
+
+
+
+# --------------- admin-only dependency: authenticated user whose role is admin ------------------------------------
+async def get_admin_user(current_user: Dict = Depends(get_authenticated_user)) -> Dict:
+    if current_user.get("role_id") != ROLE_ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
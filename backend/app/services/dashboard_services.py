@@ -1,46 +1,131 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from typing import Dict, Callable
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from typing import Awaitable, Dict, Callable, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, UTC
 
 from app.models.auth_models import User
-
-
+from app.models.dashboard_models import DashboardCounter, DashboardDailyCounter, GLOBAL_SCOPE_ID
+import app.services.role_services as role_services
+import app.services.vitals_storage_services as vitals_storage_services
+
+
+
+
+# ---- Precomputed counters (kept current by triggers, see app/models/dashboard_models.py) ----
+DASHBOARD_TREND_DAYS = 7
+
+
+async def read_dashboard_counters(
+    db: AsyncSession,
+    scope: str,
+    scope_id: int,
+    counters: List[str],
+    daily_metrics: List[str],
+    days: int = DASHBOARD_TREND_DAYS,
+) -> Dict:
+    """
+    Fetch running totals and a per-day trend for one scope.
+    Two primary-key lookups regardless of how large the fact tables grow.
+    """
+    today = datetime.now(UTC).date()
+    first_day = today - timedelta(days=days - 1)
+
+    totals = dict(
+        (await db.execute(
+            select(DashboardCounter.metric, DashboardCounter.value).where(
+                DashboardCounter.scope == scope,
+                DashboardCounter.scope_id == scope_id,
+                DashboardCounter.metric.in_(counters),
+            )
+        )).all()
+    )
+    daily_rows = (await db.execute(
+        select(DashboardDailyCounter.metric, DashboardDailyCounter.day, DashboardDailyCounter.value).where(
+            DashboardDailyCounter.scope == scope,
+            DashboardDailyCounter.scope_id == scope_id,
+            DashboardDailyCounter.metric.in_(daily_metrics),
+            DashboardDailyCounter.day.between(first_day, today),
+        )
+    )).all()
+
+    per_day = {(metric, day): value for metric, day, value in daily_rows}
+    trend_days = [first_day + timedelta(days=offset) for offset in range(days)]
+    return {
+        "counts": {metric: int(totals.get(metric, 0)) for metric in counters},
+        "today": {metric: int(per_day.get((metric, today), 0)) for metric in daily_metrics},
+        "trends": {
+            metric: [
+                {"day": day.isoformat(), "count": int(per_day.get((metric, day), 0))}
+                for day in trend_days
+            ]
+            for metric in daily_metrics
+        },
+    }
 
 
 # ---- Role-based dashboard handlers ----
-def admin_dashboard() -> Dict:
-    return {"status": 200, "message": "Welcome to Admin dashboard 🚀"}
-
-
-def doctor_dashboard() -> Dict:
-    return {"status": 200, "message": "Welcome to Doctor dashboard 🩺"}
-
-
-def patient_dashboard() -> Dict:
-    return {"status": 200, "message": "Welcome to Patient dashboard 👤"}
-
-
-def delivery_dashboard() -> Dict:
-    return {"status": 200, "message": "Welcome to Delivery dashboard 🚚"}
-
-
-def pharmacy_dashboard() -> Dict:
-    return {"status": 200, "message": "Welcome to Pharmacy dashboard 💊"}
-
-
-# ---- Role -> Function mapping ----
-ROLE_DASHBOARD_MAP: Dict[int, Callable[[], Dict]] = {
-    1: admin_dashboard,
-    2: doctor_dashboard,
-    3: patient_dashboard,
-    4: delivery_dashboard,
-    5: pharmacy_dashboard,
+async def admin_dashboard(db: AsyncSession, current_user: Dict) -> Dict:
+    data = await read_dashboard_counters(
+        db, "global", GLOBAL_SCOPE_ID,
+        counters=["open_alerts", "pending_orders", "deliveries_in_flight"],
+        daily_metrics=["appointments", "alerts", "orders", "deliveries_completed"],
+    )
+    return {"status": 200, "message": "Welcome to Admin dashboard 🚀", "data": data}
+
+
+async def doctor_dashboard(db: AsyncSession, current_user: Dict) -> Dict:
+    data = await read_dashboard_counters(
+        db, "doctor", current_user["id"],
+        counters=["open_alerts"],
+        daily_metrics=["appointments", "alerts"],
+    )
+    return {"status": 200, "message": "Welcome to Doctor dashboard 🩺", "data": data}
+
+
+async def patient_dashboard(db: AsyncSession, current_user: Dict) -> Dict:
+    data = await read_dashboard_counters(
+        db, "patient", current_user["id"],
+        counters=["open_alerts"],
+        daily_metrics=["appointments"],
+    )
+    # Last 24h at hourly resolution comes straight from the rollup table
+    data["vitals"] = await vitals_storage_services.get_vitals_series(db, current_user["id"], max_points=48)
+    return {"status": 200, "message": "Welcome to Patient dashboard 👤", "data": data}
+
+
+async def delivery_dashboard(db: AsyncSession, current_user: Dict) -> Dict:
+    data = await read_dashboard_counters(
+        db, "driver", current_user["id"],
+        counters=["deliveries_in_flight"],
+        daily_metrics=["deliveries_completed"],
+    )
+    return {"status": 200, "message": "Welcome to Delivery dashboard 🚚", "data": data}
+
+
+async def pharmacy_dashboard(db: AsyncSession, current_user: Dict) -> Dict:
+    data = await read_dashboard_counters(
+        db, "pharmacy", current_user["id"],
+        counters=["pending_orders"],
+        daily_metrics=["orders"],
+    )
+    return {"status": 200, "message": "Welcome to Pharmacy dashboard 💊", "data": data}
+
+
+# ---- Role -> Function mapping (4 = pharmacy, 5 = delivery, as on the frontend) ----
+DashboardHandler = Callable[[AsyncSession, Dict], Awaitable[Dict]]
+
+ROLE_DASHBOARD_MAP: Dict[int, DashboardHandler] = {
+    role_services.ROLE_ADMIN: admin_dashboard,
+    role_services.ROLE_DOCTOR: doctor_dashboard,
+    role_services.ROLE_PATIENT: patient_dashboard,
+    role_services.ROLE_PHARMACY: pharmacy_dashboard,
+    role_services.ROLE_DELIVERY: delivery_dashboard,
 }
 
 
 # ---- Service: Fetch dashboard based on role ----
-async def role_based_dashboard_service(db: Session, current_user: Dict) -> Dict:
+async def role_based_dashboard_service(db: AsyncSession, current_user: Dict) -> Dict:
     try:
         role_id = current_user.get("role_id") if current_user else None
         if not role_id:
@@ -49,14 +134,17 @@ async def role_based_dashboard_service(db: Session, current_user: Dict) -> Dict:
                 detail="Invalid or missing role_id in user session",
             )
         
-        dashboard_func = ROLE_DASHBOARD_MAP.get(role_id)
+        # Deactivated roles (per the roles cache) get no dashboard
+        dashboard_func = None
+        if await role_services.is_active_role(db, role_id):
+            dashboard_func = ROLE_DASHBOARD_MAP.get(role_id)
         if not dashboard_func:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"No dashboard available for role_id={role_id}",
             )
 
-        return dashboard_func()
+        return await dashboard_func(db, current_user)
 
     except HTTPException:
         raise
@@ -0,0 +1,225 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, insert, update, exists, func, literal_column
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.models.auth_models import User, ROLE_DELIVERY, ROLE_DOCTOR, ROLE_PATIENT, ROLE_PHARMACY
+from app.models.care_models import (
+    Delivery, MedicineOrder, ORDER_ASSIGNED, ORDER_PENDING, DELIVERY_IN_FLIGHT_STATUSES,
+)
+from app.schemas.order_schemas import MedicineOrderRequest
+from app.utils.metrics import Counter, Histogram
+from app.utils.spatial import GridIndex, greedy_assign, parse_coordinates
+
+# ✅ Dispatcher settings
+DISPATCH_INTERVAL_SECONDS = float(os.getenv("DISPATCH_INTERVAL_SECONDS", "5"))
+# Pending orders considered per run, oldest first
+DISPATCH_BATCH_SIZE = int(os.getenv("DISPATCH_BATCH_SIZE", "500"))
+DISPATCH_MAX_DISTANCE_KM = float(os.getenv("DISPATCH_MAX_DISTANCE_KM", "25"))
+DISPATCH_GRID_CELL_KM = float(os.getenv("DISPATCH_GRID_CELL_KM", "2"))
+# Used for the delivery ETA
+DISPATCH_AVG_SPEED_KMH = float(os.getenv("DISPATCH_AVG_SPEED_KMH", "20"))
+# Orders with no driver in range are retried after base * 2^attempts seconds, capped at max
+DISPATCH_RETRY_BASE_SECONDS = float(os.getenv("DISPATCH_RETRY_BASE_SECONDS", "30"))
+DISPATCH_RETRY_MAX_SECONDS = float(os.getenv("DISPATCH_RETRY_MAX_SECONDS", "900"))
+# Orders whose pharmacy location is not "lat,lng" wait this long (the location may get fixed)
+DISPATCH_UNLOCATABLE_RETRY_SECONDS = float(os.getenv("DISPATCH_UNLOCATABLE_RETRY_SECONDS", "3600"))
+
+orders_dispatched_total = Counter("orders_dispatched_total", "Orders assigned to a driver")
+dispatch_seconds = Histogram("dispatch_seconds", "Time for one dispatch run, including the database round trips")
+
+
+def _seconds(expression):
+    return expression * literal_column("interval '1 second'")
+
+
+async def _postpone_orders(db: AsyncSession, order_ids: List[int], delay) -> None:
+    if order_ids:
+        await db.execute(
+            update(MedicineOrder)
+            .where(MedicineOrder.id.in_(order_ids))
+            .values(
+                dispatch_attempts=MedicineOrder.dispatch_attempts + 1,
+                next_dispatch_at=func.now() + _seconds(delay),
+            )
+        )
+
+
+async def dispatch_pending_orders(db: AsyncSession) -> Dict:
+    """
+    Assign the oldest due pending orders to the nearest idle drivers and commit the deliveries.
+    Orders and the chosen drivers are locked with SKIP LOCKED so concurrent dispatchers work on disjoint sets;
+    orders that cannot be placed are pushed back so they never clog the head of the queue.
+    """
+    pharmacy = aliased(User)
+    orders = (await db.execute(
+        select(MedicineOrder.id, pharmacy.location)
+        .join(pharmacy, pharmacy.id == MedicineOrder.pharmacy_id)
+        .where(MedicineOrder.status == ORDER_PENDING, MedicineOrder.next_dispatch_at <= func.now())
+        .order_by(MedicineOrder.created_at, MedicineOrder.id)
+        .limit(DISPATCH_BATCH_SIZE)
+        .with_for_update(of=MedicineOrder, skip_locked=True)
+    )).all()
+    if not orders:
+        return {"pending": 0, "assigned": 0}
+
+    busy = exists().where(
+        Delivery.driver_id == User.id,
+        Delivery.delivery_status.in_(DELIVERY_IN_FLIGHT_STATUSES),
+    )
+    idle_driver = (User.role_id == ROLE_DELIVERY, User.is_active == True, ~busy)
+    drivers = (await db.execute(select(User.id, User.location).where(*idle_driver))).all()
+
+    index = GridIndex(cell_km=DISPATCH_GRID_CELL_KM)
+    for driver_id, location in drivers:
+        coordinates = parse_coordinates(location)
+        if coordinates is not None:
+            index.insert(driver_id, *coordinates)
+
+    requests = []
+    unlocatable = []
+    for order_id, location in orders:
+        coordinates = parse_coordinates(location)
+        if coordinates is not None:
+            requests.append((order_id, *coordinates))
+        else:
+            unlocatable.append(order_id)
+
+    proposed = greedy_assign(requests, index, DISPATCH_MAX_DISTANCE_KM)
+    matches = []
+    if proposed:
+        # Lock only the drivers actually chosen; one taken by another dispatcher (or no longer idle)
+        # leaves its order pending for the next run
+        locked = set((await db.execute(
+            select(User.id)
+            .where(User.id.in_({driver_id for _, driver_id, _ in proposed}), *idle_driver)
+            .with_for_update(of=User, skip_locked=True)
+        )).scalars().all())
+        matches = [match for match in proposed if match[1] in locked]
+
+    if matches:
+        now = datetime.now(UTC)
+        await db.execute(insert(Delivery), [
+            {
+                "order_id": order_id,
+                "driver_id": driver_id,
+                "eta": now + timedelta(hours=km / DISPATCH_AVG_SPEED_KMH),
+            }
+            for order_id, driver_id, km in matches
+        ])
+        await db.execute(
+            update(MedicineOrder)
+            .where(MedicineOrder.id.in_([order_id for order_id, _, _ in matches]))
+            .values(status=ORDER_ASSIGNED)
+        )
+
+    # No driver in range: exponential backoff. Unparseable pharmacy location: long fixed delay.
+    proposed_orders = {order_id for order_id, _, _ in proposed}
+    unmatched = [order_id for order_id, _, _ in requests if order_id not in proposed_orders]
+    await _postpone_orders(db, unmatched, func.least(
+        DISPATCH_RETRY_MAX_SECONDS,
+        DISPATCH_RETRY_BASE_SECONDS * func.power(2, MedicineOrder.dispatch_attempts),
+    ))
+    await _postpone_orders(db, unlocatable, DISPATCH_UNLOCATABLE_RETRY_SECONDS)
+    await db.commit()
+
+    orders_dispatched_total.inc(len(matches))
+    return {
+        "pending": len(orders),
+        "locatable": len(requests),
+        "idle_drivers": len(drivers),
+        "assigned": len(matches),
+        "backed_off": len(unmatched) + len(unlocatable),
+    }
+
+
+# ✅ Periodic batch dispatcher
+class OrderDispatcher:
+    def __init__(self, interval: float = DISPATCH_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_run: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+        self._stopping = asyncio.Event()
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    self.last_run = await dispatch_pending_orders(db)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print("❌ Order dispatch failed:", str(e))
+            dispatch_seconds.observe(time.perf_counter() - started)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "batch_size": DISPATCH_BATCH_SIZE,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+            "dispatched": orders_dispatched_total.value(),
+            "dispatch_seconds": dispatch_seconds.snapshot(),
+        }
+
+
+order_dispatcher = OrderDispatcher()
+
+
+# ---- Service: place a medicine order (picked up by the dispatcher) ----
+async def create_order_service(db: AsyncSession, payload: MedicineOrderRequest, current_user: Dict) -> MedicineOrder:
+    role_id = current_user.get("role_id")
+    if role_id == ROLE_PATIENT:
+        patient_id = current_user["id"]
+    elif role_id == ROLE_DOCTOR:
+        if payload.patient_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="patient_id is required")
+        patient_id = payload.patient_id
+    else:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only patients and doctors can place orders")
+
+    pharmacy = (await db.execute(
+        select(User.id).where(
+            User.id == payload.pharmacy_id,
+            User.role_id == ROLE_PHARMACY,
+            User.is_active == True,
+        )
+    )).scalar()
+    if pharmacy is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pharmacy not found")
+
+    order = MedicineOrder(
+        alert_id=payload.alert_id,
+        patient_id=patient_id,
+        pharmacy_id=payload.pharmacy_id,
+        medicine_name=payload.medicine_name,
+        dosage=payload.dosage,
+        quantity=payload.quantity,
+    )
+    db.add(order)
+    await db.commit()
+    return order
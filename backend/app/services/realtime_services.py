@@ -0,0 +1,63 @@
+import os
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.auth_models import ROLE_DOCTOR, ROLE_PATIENT
+from app.models.care_models import Appointment, APPOINTMENT_CANCELLED
+from app.utils.pubsub import PubSubHub
+from app.utils.vitals_rules import AlertEvent
+
+# Messages held per connected client before the oldest are dropped
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))
+
+dashboard_hub = PubSubHub(queue_size=WS_QUEUE_SIZE)
+
+
+def patient_topic(patient_id: int) -> str:
+    return f"patient:{patient_id}"
+
+
+async def topics_for_user(db: AsyncSession, current_user: Dict) -> Optional[List[str]]:
+    """Topics a dashboard socket follows; None when the role has no live feed."""
+    role_id = current_user.get("role_id")
+    if role_id == ROLE_DOCTOR:
+        result = await db.execute(
+            select(Appointment.patient_id)
+            .where(Appointment.doctor_id == current_user["id"], Appointment.status != APPOINTMENT_CANCELLED)
+            .distinct()
+        )
+        return [patient_topic(patient_id) for patient_id in result.scalars().all()]
+    if role_id == ROLE_PATIENT:
+        return [patient_topic(current_user["id"])]
+    return None
+
+
+def publish_vitals(rows: List) -> None:
+    """Push the latest reading per patient in an ingestion batch to any subscribed dashboards."""
+    if not dashboard_hub.has_subscribers():
+        return
+    latest = {}
+    for row in rows:
+        latest[row[0]] = row
+    for patient_id, heart_rate, spo2, temperature, recorded_at in latest.values():
+        dashboard_hub.publish(patient_topic(patient_id), {
+            "type": "vitals",
+            "patient_id": patient_id,
+            "heart_rate": heart_rate,
+            "spo2": spo2,
+            "temperature": temperature,
+            "timestamp": recorded_at.isoformat(),
+        })
+
+
+def publish_alerts(alerts: List[AlertEvent]) -> None:
+    for patient_id, alert_type, recorded_at, value in alerts:
+        dashboard_hub.publish(patient_topic(patient_id), {
+            "type": "alert",
+            "patient_id": patient_id,
+            "alert_type": alert_type,
+            "value": value,
+            "timestamp": recorded_at.isoformat(),
+        })
@@ -0,0 +1,97 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.models.auth_models import (
+    Role, ROLE_ADMIN, ROLE_DOCTOR, ROLE_PATIENT, ROLE_PHARMACY, ROLE_DELIVERY,
+)
+from app.schemas.auth_schemas import RoleResponse
+
+# Roles barely change; the TTL only bounds staleness across worker processes
+ROLES_CACHE_TTL_SECONDS = float(os.getenv("ROLES_CACHE_TTL_SECONDS", "300"))
+ROLES_CACHE_CONTROL = f"public, max-age={int(ROLES_CACHE_TTL_SECONDS)}"
+
+
+# ✅ In-memory roles cache: serialized body + ETag + id -> role lookup
+class RolesCache:
+    def __init__(self):
+        self.roles: List[Dict] = []
+        self.by_id: Dict[int, Dict] = {}
+        self.body: bytes = b"[]"
+        self.etag: str = ""
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        # An empty table is never considered fresh so seeded roles show up immediately
+        return (
+            bool(self.roles)
+            and self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < ROLES_CACHE_TTL_SECONDS
+        )
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+
+    async def load(self, db: AsyncSession) -> None:
+        roles = (await db.execute(select(Role).order_by(Role.id))).scalars().all()
+        serialized = [RoleResponse.model_validate(role).model_dump(mode="json") for role in roles]
+        self.body = json.dumps(serialized, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+        self.roles = serialized
+        self.by_id = {role["id"]: role for role in serialized}
+        self.loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if not self.is_fresh():
+                await self.load(db)
+
+
+roles_cache = RolesCache()
+
+
+@event.listens_for(Role, "after_insert")
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _invalidate_roles_cache(mapper, connection, target):
+    roles_cache.invalidate()
+
+
+async def preload_roles_cache() -> None:
+    async with AsyncSessionLocal() as db:
+        await roles_cache.load(db)
+
+
+async def get_cached_roles(db: AsyncSession) -> Tuple[List[Dict], bytes, str]:
+    """Return (roles, serialized JSON body, ETag), loading from the DB only when stale."""
+    await roles_cache.ensure_loaded(db)
+    return roles_cache.roles, roles_cache.body, roles_cache.etag
+
+
+async def is_active_role(db: AsyncSession, role_id: int) -> bool:
+    await roles_cache.ensure_loaded(db)
+    role = roles_cache.by_id.get(role_id)
+    return bool(role) and role.get("is_active", True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match is a comma-separated list of (possibly weak, W/-prefixed) tags, or "*"."""
+    if not if_none_match or not etag:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
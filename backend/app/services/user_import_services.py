@@ -0,0 +1,209 @@
+import os
+import io
+import csv
+import json
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.auth_models import User
+from app.schemas.auth_schemas import UserRegistrationRequest
+from app.services.auth_services import (
+    UNIQUE_FIELD_ERRORS,
+    find_conflicting_fields,
+    holds_unique_value,
+    unique_column,
+    unique_field_condition,
+    unique_field_values,
+)
+from app.utils.security import hash_passwords_async
+
+# Rows validated, hashed and inserted per round-trip
+USER_IMPORT_CHUNK_SIZE = int(os.getenv("USER_IMPORT_CHUNK_SIZE", "500"))
+
+SUPPORTED_IMPORT_FORMATS = ("csv", "jsonl")
+
+
+# ---- Parsing: yield (row_number, raw dict) ----
+def parse_import_rows(text_stream: Iterable[str], fmt: str) -> Iterator[Tuple[int, Dict]]:
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text_stream), start=1):
+            # Blank CSV cells mean "not provided"
+            yield row_number, {key: (value or None) for key, value in row.items() if key}
+    elif fmt == "jsonl":
+        for row_number, line in enumerate(text_stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, {"__error__": f"Invalid JSON: {e.msg}"}
+                continue
+            if not isinstance(raw, dict):
+                yield row_number, {"__error__": "Each line must be a JSON object"}
+                continue
+            yield row_number, raw
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}', expected one of {SUPPORTED_IMPORT_FORMATS}")
+
+
+def detect_import_format(filename: str) -> str:
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def parse_import_bytes(content: bytes, fmt: str) -> Iterator[Tuple[int, Dict]]:
+    return parse_import_rows(io.StringIO(content.decode("utf-8-sig")), fmt)
+
+
+# ---- Helpers ----
+def _error(row_number: int, message) -> Dict:
+    return {"row": row_number, "status": "error", "error": message}
+
+
+def _user_values(payload: UserRegistrationRequest, hashed_password: str) -> Dict:
+    return {
+        "email": payload.email,
+        "hashed_password": hashed_password,
+        "username": payload.username,
+        "phone": payload.phone,
+        "location": payload.location,
+        "role_id": payload.role,
+        "license_number": payload.license_number or None,
+        "specialization": payload.specialization,
+        "pharmacy_name": payload.pharmacy_name or None,
+        "vehicle_number": payload.vehicle_number or None,
+        "is_active": True,
+    }
+
+
+async def _taken_values(db: AsyncSession, payloads: List[UserRegistrationRequest]) -> Dict[str, Set[str]]:
+    """One set-based query per chunk: which unique values already exist in `users`."""
+    wanted: Dict[str, Set[str]] = {field: set() for field in UNIQUE_FIELD_ERRORS}
+    for payload in payloads:
+        for field, value in unique_field_values(payload).items():
+            wanted[field].add(value)
+
+    conditions = [unique_field_condition(field, values) for field, values in wanted.items() if values]
+    taken: Dict[str, Set[str]] = {field: set() for field in UNIQUE_FIELD_ERRORS}
+    if not conditions:
+        return taken
+
+    columns = [unique_column(field) for field in UNIQUE_FIELD_ERRORS]
+    rows = (await db.execute(select(User.role_id, *columns).where(or_(*conditions)))).all()
+    for role_id, *row in rows:
+        for field, existing in zip(UNIQUE_FIELD_ERRORS, row):
+            if existing in wanted[field] and holds_unique_value(field, role_id):
+                taken[field].add(existing)
+    return taken
+
+
+async def _insert_rows_individually(db: AsyncSession, rows: List[Tuple[int, UserRegistrationRequest, Dict]]):
+    """Fallback when a chunk insert races with another writer: insert row by row."""
+    for row_number, payload, values in rows:
+        try:
+            user_id = await db.scalar(insert(User).values(**values).returning(User.id))
+            await db.commit()
+            yield {"row": row_number, "status": "created", "id": user_id, "email": payload.email}
+        except IntegrityError:
+            await db.rollback()
+            conflicts = await find_conflicting_fields(db, unique_field_values(payload))
+            message = UNIQUE_FIELD_ERRORS[conflicts[0]] if conflicts else "Integrity error (check role)"
+            yield _error(row_number, message)
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, Dict]],
+    seen_in_file: Dict[str, Set[str]],
+) -> AsyncIterator[Dict]:
+    # 1. Validate with the same schema as single registration
+    valid: List[Tuple[int, UserRegistrationRequest]] = []
+    for row_number, raw in chunk:
+        if "__error__" in raw:
+            yield _error(row_number, raw["__error__"])
+            continue
+        try:
+            valid.append((row_number, UserRegistrationRequest(**raw)))
+        except ValidationError as e:
+            yield _error(row_number, [
+                {"field": ".".join(str(part) for part in err["loc"]), "message": err["msg"]}
+                for err in e.errors()
+            ])
+
+    # 2. Uniqueness against the file so far and the database (one query)
+    taken = await _taken_values(db, [payload for _, payload in valid])
+    accepted: List[Tuple[int, UserRegistrationRequest]] = []
+    for row_number, payload in valid:
+        values = unique_field_values(payload)
+        clash = next((field for field, value in values.items() if value in taken[field]), None)
+        if clash:
+            yield _error(row_number, UNIQUE_FIELD_ERRORS[clash])
+            continue
+        duplicate = next((field for field, value in values.items() if value in seen_in_file[field]), None)
+        if duplicate:
+            yield _error(row_number, f"Duplicate {duplicate} within the import file")
+            continue
+        for field, value in values.items():
+            seen_in_file[field].add(value)
+        accepted.append((row_number, payload))
+
+    if not accepted:
+        return
+
+    # 3. Hash passwords in parallel on the hashing pool
+    hashed = await hash_passwords_async([payload.password for _, payload in accepted])
+    rows = [
+        (row_number, payload, _user_values(payload, hashed_password))
+        for (row_number, payload), hashed_password in zip(accepted, hashed)
+    ]
+
+    # 4. Multi-row insert; fall back to row-by-row if a concurrent writer won a race
+    try:
+        result = await db.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [values for _, _, values in rows],
+        )
+        user_ids = result.scalars().all()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        async for outcome in _insert_rows_individually(db, rows):
+            yield outcome
+        return
+
+    for (row_number, payload, _), user_id in zip(rows, user_ids):
+        yield {"row": row_number, "status": "created", "id": user_id, "email": payload.email}
+
+
+# ---- Service: bulk import, streaming one result per row and a final summary ----
+async def import_users_service(db: AsyncSession, rows: Iterable[Tuple[int, Dict]]) -> AsyncIterator[Dict]:
+    seen_in_file: Dict[str, Set[str]] = {field: set() for field in UNIQUE_FIELD_ERRORS}
+    created = failed = 0
+
+    chunk: List[Tuple[int, Dict]] = []
+
+    async def flush():
+        nonlocal created, failed
+        async for outcome in _import_chunk(db, chunk, seen_in_file):
+            if outcome["status"] == "created":
+                created += 1
+            else:
+                failed += 1
+            yield outcome
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= USER_IMPORT_CHUNK_SIZE:
+            async for outcome in flush():
+                yield outcome
+            chunk = []
+
+    if chunk:
+        async for outcome in flush():
+            yield outcome
+
+    yield {"summary": {"created": created, "failed": failed}}
@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.auth_models import User
+
+USER_LIST_MAX_LIMIT = 200
+
+# Columns callers may project; hashed_password is never listable
+USER_LIST_FIELDS = (
+    "id", "email", "username", "phone", "location", "role_id", "is_active",
+    "license_number", "specialization", "pharmacy_name", "vehicle_number",
+)
+USER_LIST_DEFAULT_FIELDS = ("id", "username", "email", "role_id", "is_active")
+
+
+def parse_user_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(USER_LIST_DEFAULT_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in USER_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    # id is the pagination cursor, so it is always returned
+    return ["id"] + [field for field in dict.fromkeys(requested) if field != "id"]
+
+
+# ---- Service: keyset-paginated user listing ----
+async def list_users_service(
+    db: AsyncSession,
+    fields: Sequence[str],
+    after_id: int = 0,
+    limit: int = 50,
+    role_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    specialization: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Dict:
+    query = select(*[getattr(User, field) for field in fields]).where(User.id > after_id)
+    if role_id is not None:
+        query = query.where(User.role_id == role_id)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    # Case-insensitive exact matches, served by the lower(...) indexes
+    if specialization:
+        query = query.where(func.lower(User.specialization) == specialization.strip().lower())
+    if location:
+        query = query.where(func.lower(User.location) == location.strip().lower())
+
+    # One extra row tells us whether another page exists without a COUNT(*)
+    rows = (await db.execute(query.order_by(User.id).limit(limit + 1))).mappings().all()
+    has_more = len(rows) > limit
+    items = [dict(row) for row in rows[:limit]]
+    return {
+        "items": items,
+        "next_after_id": items[-1]["id"] if has_more else None,
+    }
@@ -0,0 +1,226 @@
+import os
+import time
+import asyncio
+from typing import Dict, List, Tuple
+
+import asyncpg
+from fastapi import HTTPException, status
+
+from app.db.database import async_engine
+from app.models.vitals_models import VitalsRecord, VITALS_COPY_COLUMNS
+from app.schemas.vitals_schemas import VitalReading
+from app.utils.metrics import Counter, Histogram
+from app.services.role_services import ROLE_ADMIN, ROLE_DOCTOR, ROLE_PATIENT
+from app.services.alert_services import evaluate_vitals_rows
+from app.services.realtime_services import publish_vitals
+
+# ✅ Ingestion buffer settings
+VITALS_FLUSH_ROWS = int(os.getenv("VITALS_FLUSH_ROWS", "5000"))
+VITALS_FLUSH_INTERVAL_SECONDS = float(os.getenv("VITALS_FLUSH_INTERVAL_SECONDS", "0.5"))
+# Readings buffered or being written before new submissions get a 429
+VITALS_MAX_BUFFERED_ROWS = int(os.getenv("VITALS_MAX_BUFFERED_ROWS", "200000"))
+VITALS_RETRY_AFTER_SECONDS = os.getenv("VITALS_RETRY_AFTER_SECONDS", "1")
+# Attempts per batch when the database is unavailable; bad rows are isolated instead of retried
+VITALS_FLUSH_MAX_ATTEMPTS = int(os.getenv("VITALS_FLUSH_MAX_ATTEMPTS", "3"))
+# Role ids (besides admin) allowed to submit readings for any patient, e.g. a device gateway account
+VITALS_WRITER_ROLE_IDS = {
+    int(role_id) for role_id in os.getenv("VITALS_WRITER_ROLE_IDS", "").split(",") if role_id.strip()
+}
+
+VitalsRow = Tuple
+
+vitals_ingested_total = Counter("vitals_ingested_total", "Readings written to vitals_records")
+vitals_rejected_total = Counter("vitals_rejected_total", "Readings rejected because the buffer was full")
+vitals_dropped_total = Counter("vitals_dropped_total", "Readings dropped after a failed flush")
+vitals_invalid_total = Counter("vitals_invalid_total", "Readings the database refused (e.g. unknown patient_id)")
+vitals_flush_seconds = Histogram("vitals_flush_seconds", "Time to COPY one batch into vitals_records")
+
+
+def is_row_error(exc: Exception) -> bool:
+    """Failures caused by the rows themselves (SQLSTATE class 22 data / 23 integrity, or client-side encoding)."""
+    if isinstance(exc, asyncpg.PostgresError):
+        return (exc.sqlstate or "")[:2] in ("22", "23")
+    return isinstance(exc, (ValueError, TypeError))
+
+
+def reading_to_row(reading: VitalReading) -> VitalsRow:
+    return (reading.patient_id, reading.heart_rate, reading.spo2, reading.temperature, reading.timestamp)
+
+
+# ✅ In-memory buffer flushed with COPY on size or time thresholds
+class VitalsIngestBuffer:
+    def __init__(
+        self,
+        flush_rows: int = VITALS_FLUSH_ROWS,
+        flush_interval: float = VITALS_FLUSH_INTERVAL_SECONDS,
+        max_buffered_rows: int = VITALS_MAX_BUFFERED_ROWS,
+    ):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self._rows: List[VitalsRow] = []
+        self._in_flight = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._rows) + self._in_flight
+
+    def submit(self, rows: List[VitalsRow]) -> None:
+        """Queue rows for the next flush, or reject the whole submission with 429 when full."""
+        if self.depth + len(rows) > self.max_buffered_rows:
+            vitals_rejected_total.inc(len(rows))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Vitals ingestion is saturated, please retry shortly",
+                headers={"Retry-After": VITALS_RETRY_AFTER_SECONDS},
+            )
+        self._rows.extend(rows)
+        if len(self._rows) >= self.flush_rows:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain whatever is still buffered."""
+        self._running = False
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._running or self._rows:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._rows:
+                batch, self._rows = self._rows[:self.flush_rows], self._rows[self.flush_rows:]
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[VitalsRow]) -> None:
+        self._in_flight = len(batch)
+        started = time.perf_counter()
+        try:
+            await self._write(batch)
+        finally:
+            self._in_flight = 0
+            vitals_flush_seconds.observe(time.perf_counter() - started)
+
+    async def _write(self, batch: List[VitalsRow], attempt: int = 1) -> None:
+        """
+        COPY one batch. A batch refused because of its contents is split in halves until the
+        offending rows are isolated and dropped; other failures are retried a bounded number of times.
+        """
+        try:
+            vitals_ids = await write_vitals_rows(batch)
+        except Exception as e:
+            if is_row_error(e):
+                if len(batch) == 1:
+                    print("❌ Dropping invalid vitals reading:", batch[0], str(e))
+                    vitals_invalid_total.inc()
+                    return
+                middle = len(batch) // 2
+                await self._write(batch[:middle])
+                await self._write(batch[middle:])
+                return
+
+            print("❌ Failed to flush vitals batch:", str(e))
+            if self._running and attempt < VITALS_FLUSH_MAX_ATTEMPTS:
+                await asyncio.sleep(self.flush_interval * attempt)
+                await self._write(batch, attempt + 1)
+            else:
+                vitals_dropped_total.inc(len(batch))
+            return
+
+        vitals_ingested_total.inc(len(batch))
+        # Rules run on stored readings only, so every alert can point at its vitals_records row
+        try:
+            evaluate_vitals_rows(batch, vitals_ids)
+        except Exception as e:
+            print("❌ Failed to evaluate vitals rules:", str(e))
+
+    def stats(self) -> Dict:
+        return {
+            "buffered": len(self._rows),
+            "in_flight": self._in_flight,
+            "max_buffered_rows": self.max_buffered_rows,
+            "flush_rows": self.flush_rows,
+            "flush_interval_seconds": self.flush_interval,
+            "ingested": vitals_ingested_total.value(),
+            "rejected": vitals_rejected_total.value(),
+            "dropped": vitals_dropped_total.value(),
+            "invalid": vitals_invalid_total.value(),
+            "flush_seconds": vitals_flush_seconds.snapshot(),
+        }
+
+
+async def write_vitals_rows(rows: List[VitalsRow]) -> List[int]:
+    """Bulk-load rows with asyncpg's binary COPY; ids are reserved from the sequence first and returned."""
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        ids = [record[0] for record in await driver.fetch(VITALS_RESERVE_IDS_SQL, len(rows))]
+        await driver.copy_records_to_table(
+            VitalsRecord.__tablename__,
+            records=[(vitals_id, *row) for vitals_id, row in zip(ids, rows)],
+            columns=["id", *VITALS_COPY_COLUMNS],
+        )
+    return ids
+
+
+# COPY cannot return generated keys, so a batch's ids are taken from the sequence up front
+VITALS_RESERVE_IDS_SQL = (
+    f"SELECT nextval(pg_get_serial_sequence('{VitalsRecord.__tablename__}', 'id')) FROM generate_series(1, $1)"
+)
+
+vitals_buffer = VitalsIngestBuffer()
+
+
+# ---- Service: accept readings from an authenticated user ----
+def check_vitals_writer(readings: List[VitalReading], current_user: Dict) -> None:
+    """Patients may only write their own readings; otherwise only admins and configured device roles."""
+    role_id = current_user.get("role_id")
+    if role_id == ROLE_PATIENT:
+        if any(r.patient_id != current_user["id"] for r in readings):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Patients can only submit their own vitals",
+            )
+    elif role_id != ROLE_ADMIN and role_id not in VITALS_WRITER_ROLE_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to submit vitals",
+        )
+
+
+def check_vitals_reader(patient_id: int, current_user: Dict) -> None:
+    """Patients may only read their own readings; doctors and admins may read any patient's."""
+    role_id = current_user.get("role_id")
+    if role_id == ROLE_PATIENT:
+        if patient_id != current_user["id"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Patients can only read their own vitals",
+            )
+    elif role_id not in (ROLE_DOCTOR, ROLE_ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to read vitals",
+        )
+
+
+def ingest_vitals_service(readings: List[VitalReading], current_user: Dict) -> int:
+    check_vitals_writer(readings, current_user)
+    rows = [reading_to_row(reading) for reading in readings]
+    vitals_buffer.submit(rows)
+    # Alerts are raised by the flusher once the readings are stored
+    publish_vitals(rows)
+    return len(readings)
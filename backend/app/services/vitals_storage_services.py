@@ -0,0 +1,244 @@
+import os
+import asyncio
+from datetime import date, datetime, timedelta, UTC
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import async_engine
+from app.models.vitals_models import (
+    VitalsRecord, VitalsRollup1m, VitalsRollup1h, create_vitals_partitions,
+)
+from app.utils.metrics import Counter, Histogram
+
+# ✅ Rollup job settings
+VITALS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("VITALS_ROLLUP_INTERVAL_SECONDS", "60"))
+# Minute buckets recomputed on every run; readings arriving later than this are not re-aggregated
+VITALS_ROLLUP_LOOKBACK_MINUTES = int(os.getenv("VITALS_ROLLUP_LOOKBACK_MINUTES", "15"))
+# Arbitrary constant so only one worker process runs the rollup at a time
+VITALS_ROLLUP_LOCK_KEY = int(os.getenv("VITALS_ROLLUP_LOCK_KEY", "724011"))
+
+# ✅ Query settings
+# Expected spacing of raw readings per patient, used to estimate raw point counts
+VITALS_RAW_INTERVAL_SECONDS = float(os.getenv("VITALS_RAW_INTERVAL_SECONDS", "5"))
+VITALS_DEFAULT_MAX_POINTS = int(os.getenv("VITALS_DEFAULT_MAX_POINTS", "500"))
+VITALS_MAX_QUERY_POINTS = 5000
+
+vitals_rollup_runs_total = Counter("vitals_rollup_runs_total", "Rollup runs by outcome", ("outcome",))
+vitals_rollup_seconds = Histogram("vitals_rollup_seconds", "Time to refresh the 1m and 1h rollups")
+
+
+# ---- Rollup SQL ----
+# Buckets are truncated in UTC so hourly buckets stay aligned regardless of session time zone.
+# Rows are recomputed from source and replaced, so re-running a window is idempotent.
+_ROLLUP_COLUMNS = (
+    "hr_count, hr_min, hr_max, hr_sum, "
+    "spo2_count, spo2_min, spo2_max, spo2_sum, "
+    "temp_count, temp_min, temp_max, temp_sum"
+)
+_ROLLUP_UPSERT = "ON CONFLICT (patient_id, bucket) DO UPDATE SET " + ", ".join(
+    f"{col} = EXCLUDED.{col}" for col in _ROLLUP_COLUMNS.split(", ")
+)
+
+ROLLUP_1M_SQL = text(f"""
+    INSERT INTO {VitalsRollup1m.__tablename__} (patient_id, bucket, {_ROLLUP_COLUMNS})
+    SELECT patient_id,
+           date_trunc('minute', recorded_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket,
+           count(heart_rate), min(heart_rate), max(heart_rate), sum(heart_rate),
+           count(spo2), min(spo2), max(spo2), sum(spo2),
+           count(temperature), min(temperature), max(temperature), sum(temperature)
+    FROM {VitalsRecord.__tablename__}
+    WHERE recorded_at >= :since AND recorded_at < :until
+    GROUP BY 1, 2
+    {_ROLLUP_UPSERT}
+""")
+
+ROLLUP_1H_SQL = text(f"""
+    INSERT INTO {VitalsRollup1h.__tablename__} (patient_id, bucket, {_ROLLUP_COLUMNS})
+    SELECT patient_id,
+           date_trunc('hour', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour_bucket,
+           sum(hr_count), min(hr_min), max(hr_max), sum(hr_sum),
+           sum(spo2_count), min(spo2_min), max(spo2_max), sum(spo2_sum),
+           sum(temp_count), min(temp_min), max(temp_max), sum(temp_sum)
+    FROM {VitalsRollup1m.__tablename__}
+    WHERE bucket >= :since AND bucket < :until
+    GROUP BY 1, 2
+    {_ROLLUP_UPSERT}
+""")
+
+
+def floor_to(moment: datetime, seconds: int) -> datetime:
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, UTC)
+
+
+# ✅ Background job refreshing rollups and keeping monthly partitions ahead of time
+class VitalsRollupJob:
+    def __init__(self, interval: float = VITALS_ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._partitions_checked_on: Optional[date] = None
+        self._stopping = asyncio.Event()
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.last_error = str(e)
+                vitals_rollup_runs_total.inc(outcome="error")
+                print("❌ Vitals rollup failed:", str(e))
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self, now: Optional[datetime] = None) -> bool:
+        """Refresh recent rollup buckets; returns False when another worker holds the lock."""
+        now = now or datetime.now(UTC)
+        minute_since = floor_to(now - timedelta(minutes=VITALS_ROLLUP_LOOKBACK_MINUTES), 60)
+        # Hour buckets touched by the recomputed minutes
+        hour_since = floor_to(minute_since, 3600)
+        started = asyncio.get_running_loop().time()
+
+        async with async_engine.begin() as conn:
+            locked = (await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": VITALS_ROLLUP_LOCK_KEY}
+            )).scalar()
+            if not locked:
+                vitals_rollup_runs_total.inc(outcome="skipped")
+                return False
+
+            if self._partitions_checked_on != now.date():
+                await conn.run_sync(create_vitals_partitions, now.date())
+                self._partitions_checked_on = now.date()
+
+            await conn.execute(ROLLUP_1M_SQL, {"since": minute_since, "until": now})
+            await conn.execute(ROLLUP_1H_SQL, {"since": hour_since, "until": now})
+
+        vitals_rollup_seconds.observe(asyncio.get_running_loop().time() - started)
+        vitals_rollup_runs_total.inc(outcome="ok")
+        self.last_run_at = now
+        self.last_error = None
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "lookback_minutes": VITALS_ROLLUP_LOOKBACK_MINUTES,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_error": self.last_error,
+            "runs": vitals_rollup_runs_total.snapshot(),
+            "rollup_seconds": vitals_rollup_seconds.snapshot(),
+        }
+
+
+vitals_rollup_job = VitalsRollupJob()
+
+
+# ---- Query: pick the finest resolution that fits in max_points ----
+VITALS_RESOLUTIONS = (
+    ("raw", VITALS_RAW_INTERVAL_SECONDS),
+    ("1m", 60),
+    ("1h", 3600),
+)
+
+
+def choose_vitals_resolution(start: datetime, end: datetime, max_points: int) -> str:
+    span = (end - start).total_seconds()
+    for name, seconds in VITALS_RESOLUTIONS:
+        if span / seconds <= max_points:
+            return name
+    return VITALS_RESOLUTIONS[-1][0]
+
+
+def _stat(count, minimum, maximum, total) -> Optional[Dict]:
+    if not count:
+        return None
+    return {"min": minimum, "max": maximum, "avg": round(float(total) / count, 2)}
+
+
+async def _raw_points(db: AsyncSession, patient_id: int, start: datetime, end: datetime, limit: int) -> List[Dict]:
+    result = await db.execute(
+        select(VitalsRecord.recorded_at, VitalsRecord.heart_rate, VitalsRecord.spo2, VitalsRecord.temperature)
+        .where(
+            VitalsRecord.patient_id == patient_id,
+            VitalsRecord.recorded_at >= start,
+            VitalsRecord.recorded_at < end,
+        )
+        .order_by(VitalsRecord.recorded_at)
+        .limit(limit)
+    )
+    return [
+        {"timestamp": recorded_at, "heart_rate": heart_rate, "spo2": spo2, "temperature": temperature}
+        for recorded_at, heart_rate, spo2, temperature in result.all()
+    ]
+
+
+async def _rollup_points(db: AsyncSession, model, patient_id: int, start: datetime, end: datetime) -> List[Dict]:
+    result = await db.execute(
+        select(model)
+        .where(model.patient_id == patient_id, model.bucket >= start, model.bucket < end)
+        .order_by(model.bucket)
+    )
+    return [
+        {
+            "timestamp": row.bucket,
+            "heart_rate": _stat(row.hr_count, row.hr_min, row.hr_max, row.hr_sum),
+            "spo2": _stat(row.spo2_count, row.spo2_min, row.spo2_max, row.spo2_sum),
+            "temperature": _stat(row.temp_count, row.temp_min, row.temp_max, row.temp_sum),
+        }
+        for row in result.scalars().all()
+    ]
+
+
+async def get_vitals_series(
+    db: AsyncSession,
+    patient_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: int = VITALS_DEFAULT_MAX_POINTS,
+    resolution: Optional[str] = None,
+) -> Dict:
+    end = end or datetime.now(UTC)
+    start = start or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if resolution is not None and resolution not in dict(VITALS_RESOLUTIONS):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown resolution")
+
+    resolution = resolution or choose_vitals_resolution(start, end, max_points)
+    if (end - start).total_seconds() / dict(VITALS_RESOLUTIONS)[resolution] > VITALS_MAX_QUERY_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Time range is too large for the requested resolution",
+        )
+    if resolution == "raw":
+        points = await _raw_points(db, patient_id, start, end, limit=VITALS_MAX_QUERY_POINTS)
+    elif resolution == "1m":
+        points = await _rollup_points(db, VitalsRollup1m, patient_id, start, end)
+    else:
+        points = await _rollup_points(db, VitalsRollup1h, patient_id, start, end)
+
+    return {
+        "patient_id": patient_id,
+        "resolution": resolution,
+        "start": start,
+        "end": end,
+        "points": points,
+    }
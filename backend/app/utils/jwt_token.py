@@ -1,6 +1,8 @@
 # utils/jwt.py
 
 import os
+import time
+import hashlib
 from datetime import datetime, timedelta, UTC
 from jose import jwt, JWTError
 from dotenv import load_dotenv
@@ -10,6 +12,9 @@ from starlette import status
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 
+from app.utils.cache import TTLCache
+from app.utils.metrics import Histogram, record_request_time
+
 # Load environment variables
 load_dotenv()
 
@@ -30,6 +35,16 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 REFRESH_TOKEN_EXPIRE_DAYS = 7  # 7 days
 
+# Verified-token cache (sha256(token) -> claims); entries never outlive the token's `exp`
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "20000"))
+JWT_CACHE_MAX_TTL_SECONDS = float(os.getenv("JWT_CACHE_MAX_TTL_SECONDS", "300"))
+verified_token_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_MAX_TTL_SECONDS)
+
+jwt_decode_seconds = Histogram(
+    "auth_jwt_decode_seconds", "Time to verify a JWT", ["cache"],
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
 
 # ✅ Create an access token (short-lived, used for authentication)
 def create_access_token(username: str, user_id: int, expires_delta: timedelta = None):
@@ -55,16 +70,37 @@ def create_refresh_token(username: str, user_id: int, expires_delta: timedelta =
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-# ✅ Decode and validate any JWT token
+def _observe_decode(started: float, cache: str) -> None:
+    elapsed = time.perf_counter() - started
+    jwt_decode_seconds.observe(elapsed, cache=cache)
+    record_request_time("jwt", elapsed)
+
+
+# ✅ Decode and validate any JWT token (verified payloads are cached by token digest)
 def decode_jwt_token(token: str):
+    started = time.perf_counter()
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached_payload = verified_token_cache.get(cache_key)
+    if cached_payload is not None:
+        _observe_decode(started, "hit")
+        return dict(cached_payload)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
+        _observe_decode(started, "invalid")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
+    _observe_decode(started, "miss")
+
+    ttl = JWT_CACHE_MAX_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, float(payload["exp"]) - time.time())
+    if ttl > 0:
+        verified_token_cache.set(cache_key, payload, ttl=ttl)
+    return dict(payload)
 
 
 # ✅ Check if an access token is expired
@@ -0,0 +1,193 @@
+# utils/metrics.py
+
+import math
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Default latency buckets in seconds (1ms .. 10s)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+# Every metric registers itself here so /metrics can render all of them
+REGISTRY: Dict[str, object] = {}
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items()) + "}"
+
+
+# ✅ Monotonic counter, optionally split by label values
+class Counter:
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = dict(self._values)
+        if not self.labelnames:
+            return {"value": values.get((), 0.0)}
+        return {
+            "values": [
+                {"labels": dict(zip(self.labelnames, key)), "value": value}
+                for key, value in values.items()
+            ]
+        }
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labelnames:
+            values = {(): 0.0}
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values.items()]
+
+
+# ✅ Value that can go up and down (in-flight requests, queue depth)
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+# ✅ Cumulative-bucket histogram (Prometheus semantics)
+class Histogram:
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _series_snapshot(self, key: Tuple[str, ...], series: list) -> Dict:
+        cumulative, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[0]):
+            running += count
+            cumulative.append({"le": "+Inf" if bound == float("inf") else bound, "count": running})
+        return {
+            "labels": dict(zip(self.labelnames, key)),
+            "buckets": cumulative,
+            "sum": series[1],
+            "count": series[2],
+        }
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            items = [(key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items()]
+        series = [self._series_snapshot(key, s) for key, s in items]
+        if not self.labelnames:
+            return series[0] if series else self._series_snapshot((), [[0] * (len(self.buckets) + 1), 0.0, 0])
+        return {"series": series}
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2]) for key, s in self._series.items()]
+        lines = []
+        for key, counts, total, count in items:
+            labels = dict(zip(self.labelnames, key))
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                running += bucket_count
+                lines.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, running))
+            lines.append((f"{self.name}_sum", labels, total))
+            lines.append((f"{self.name}_count", labels, count))
+        return lines
+
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name, metric in sorted(REGISTRY.items()):
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.metric_type}")
+        for sample_name, labels, value in metric.samples():
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---- Per-request time breakdown (db, bcrypt, jwt, ...) ----
+# Set by the request middleware; code outside a request sees None and records nothing
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings():
+    """Begin collecting for the current request; returns the token for `_request_timings.reset`."""
+    return _request_timings.set({})
+
+
+def current_request_timings() -> Optional[Dict[str, float]]:
+    return _request_timings.get()
+
+
+def reset_request_timings(token) -> None:
+    _request_timings.reset(token)
+
+
+def record_request_time(component: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[component] = timings.get(component, 0.0) + seconds
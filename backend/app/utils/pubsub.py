@@ -0,0 +1,81 @@
+import json
+import asyncio
+from typing import Dict, Iterable, Optional, Set
+
+from app.utils.metrics import Counter
+
+pubsub_published_total = Counter("pubsub_published_total", "Messages delivered to subscriber queues")
+pubsub_dropped_total = Counter("pubsub_dropped_total", "Messages dropped because a subscriber queue was full")
+
+
+class Subscription:
+    """One consumer (e.g. a WebSocket) with a bounded queue of serialized messages."""
+
+    __slots__ = ("topics", "queue", "dropped", "closed")
+
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, message: Optional[str]) -> None:
+        # Slow consumers lose their oldest messages instead of blocking publishers
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            pubsub_dropped_total.inc()
+        self.queue.put_nowait(message)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.offer(None)  # wakes up the consumer
+
+    async def get(self) -> Optional[str]:
+        """Next message, or None once the subscription is closed."""
+        return await self.queue.get()
+
+
+# ✅ In-process topic hub; publish is synchronous and never waits on subscribers
+class PubSubHub:
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.queue_size)
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+        subscription.close()
+
+    def has_subscribers(self, topic: Optional[str] = None) -> bool:
+        return bool(self._subscribers) if topic is None else topic in self._subscribers
+
+    def publish(self, topic: str, message: Dict) -> int:
+        """Serialize once and fan out; returns the number of subscribers reached."""
+        subscribers = self._subscribers.get(topic)
+        if not subscribers:
+            return 0
+        payload = json.dumps({"topic": topic, **message}, default=str)
+        for subscription in subscribers:
+            subscription.offer(payload)
+        pubsub_published_total.inc(len(subscribers))
+        return len(subscribers)
+
+    def stats(self) -> Dict:
+        return {
+            "topics": len(self._subscribers),
+            "subscriptions": len({s for subs in self._subscribers.values() for s in subs}),
+            "published": pubsub_published_total.value(),
+            "dropped": pubsub_dropped_total.value(),
+        }
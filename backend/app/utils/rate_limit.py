@@ -0,0 +1,113 @@
+# utils/rate_limit.py
+
+import math
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.utils.metrics import Counter
+
+rate_limited_total = Counter("rate_limited_total", "Requests rejected by a rate limiter", ["limiter"])
+
+
+# ✅ Storage interface so buckets can live in a shared store (e.g. Redis) when running several workers
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: Hashable, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        """Consume `cost` tokens; returns 0 when allowed, otherwise seconds until enough tokens exist."""
+
+    @abstractmethod
+    async def reset(self, key: Hashable) -> None:
+        """Forget the bucket for `key` (it starts full again)."""
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+# ✅ Process-local backend: one small bucket per key, idle buckets evicted in LRU order
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float, capacity: float, refill_per_second: float) -> None:
+        # A bucket that has had time to refill completely is equivalent to no bucket at all
+        full_after = capacity / refill_per_second
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket.updated_at < full_after and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[key]
+
+    async def take(self, key: Hashable, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(capacity, now)
+            else:
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * refill_per_second)
+                bucket.updated_at = now
+                self._buckets.move_to_end(key)
+
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - bucket.tokens) / refill_per_second
+            self._evict(now, capacity, refill_per_second)
+        return wait
+
+    async def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# ✅ Named token-bucket limit (burst `capacity`, sustained `per_minute`)
+class RateLimiter:
+    def __init__(self, name: str, capacity: float, per_minute: float, backend: Optional[RateLimitBackend] = None):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = per_minute / 60.0
+        # Each limiter gets its own keyspace unless a shared backend is passed in
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    async def hit(self, key: Hashable, detail: str = "Too many requests, please retry later") -> None:
+        """Consume one token for `key` or raise 429 with Retry-After."""
+        wait = await self.backend.take((self.name, key), self.capacity, self.refill_per_second)
+        if wait > 0:
+            rate_limited_total.inc(limiter=self.name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=detail,
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    async def reset(self, key: Hashable) -> None:
+        await self.backend.reset((self.name, key))
+
+
+def client_ip(request: Request, trusted_hops: int = 0) -> Optional[str]:
+    """
+    Caller address. Behind `trusted_hops` proxies, each appending to X-Forwarded-For, the client is the
+    entry that many places from the right; entries further left are client-supplied and ignored.
+    """
+    if trusted_hops > 0:
+        forwarded = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+        if forwarded:
+            # Fewer entries than proxies: every entry was appended by a trusted proxy
+            return forwarded[max(0, len(forwarded) - trusted_hops)]
+    return request.client.host if request.client else None
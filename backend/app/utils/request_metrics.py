@@ -0,0 +1,111 @@
+# utils/request_metrics.py
+
+import hmac
+import ipaddress
+import os
+import time
+
+from fastapi import HTTPException, Request, status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    current_request_timings,
+    reset_request_timings,
+    start_request_timings,
+)
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route"]
+)
+http_requests_total = Counter(
+    "http_requests_total", "Requests by route template and status code", ["method", "route", "status"]
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "Requests currently being handled")
+http_request_component_seconds = Histogram(
+    "http_request_component_seconds",
+    "Per-request time spent in db, bcrypt and jwt",
+    ["route", "component"],
+    # Cached JWT checks and small queries finish in tens of microseconds; the default 1ms floor hides them
+    buckets=(
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+    ),
+)
+
+# ---- /metrics access ----
+# Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>"; without a token only these networks may scrape
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_NETWORKS = [
+    ipaddress.ip_network(network.strip(), strict=False)
+    for network in os.getenv("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128").split(",")
+    if network.strip()
+]
+
+
+def _client_in_allowed_networks(host) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except (TypeError, ValueError):
+        return False
+    return any(address in network for network in METRICS_ALLOWED_NETWORKS)
+
+
+def require_metrics_access(request: Request) -> None:
+    """Dependency for /metrics: a matching bearer token, or a direct connection from an allowed network."""
+    if METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), METRICS_TOKEN):
+            return
+    elif _client_in_allowed_networks(request.client.host if request.client else None):
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics access denied")
+
+
+def _route_template(scope: Scope) -> str:
+    # Templates ("/api/vitals/{patient_id}") keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+# ✅ Pure ASGI middleware (no BaseHTTPMiddleware) so streaming responses pass straight through
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = start_request_timings()
+        timings = current_request_timings()
+        status_code = 500
+        http_requests_in_flight.inc()
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Server-Timing shows the breakdown in browser devtools (time to first byte)
+                parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+                parts.append(f"app;dur={(time.perf_counter() - started) * 1000:.1f}")
+                MutableHeaders(scope=message).append("Server-Timing", ", ".join(parts))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            route = _route_template(scope)
+            method = scope["method"]
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            for component, seconds in timings.items():
+                http_request_component_seconds.observe(seconds, route=route, component=component)
+            reset_request_timings(token)
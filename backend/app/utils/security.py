@@ -1,8 +1,44 @@
+import os
+import time
+import asyncio
+import threading
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from starlette import status
 from passlib.context import CryptContext
 
+from app.utils.metrics import Counter, Histogram, record_request_time
+
 # Configure passlib to use bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# ✅ Hashing pool settings
+# bcrypt releases the GIL while hashing, so a thread pool scales with cores.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+# Max hash jobs queued or running before new requests are rejected with 429
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", HASH_WORKERS * 8))
+HASH_RETRY_AFTER_SECONDS = os.getenv("HASH_RETRY_AFTER_SECONDS", "1")
+# Concurrent hash jobs a bulk import may occupy
+HASH_BULK_CONCURRENCY = int(os.getenv("HASH_BULK_CONCURRENCY", max(1, HASH_WORKERS // 2)))
+
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending_lock = threading.Lock()
+_pending = 0
+_bulk_hash_slots = asyncio.Semaphore(HASH_BULK_CONCURRENCY)
+
+# Hashing metrics
+hash_queue_wait_seconds = Histogram(
+    "auth_hash_queue_wait_seconds", "Time a hash job waited for a pool worker", ["operation"]
+)
+hash_duration_seconds = Histogram(
+    "auth_hash_duration_seconds", "Time spent inside bcrypt", ["operation"]
+)
+hash_rejected_total = Counter(
+    "auth_hash_rejected_total", "Hash jobs rejected because the pool queue was full", ["operation"]
+)
+
+
 def hash_password(password: str) -> str:
     """Hash a plain password."""
     return pwd_context.hash(password)
@@ -10,3 +46,85 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against the hashed one."""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def _submit_to_hash_pool(operation: str, func, *args):
+    """Schedule a bcrypt call on the pool, recording queue wait and hash time."""
+    submitted = time.perf_counter()
+
+    def timed_call():
+        started = time.perf_counter()
+        hash_queue_wait_seconds.observe(started - submitted, operation=operation)
+        try:
+            return func(*args)
+        finally:
+            hash_duration_seconds.observe(time.perf_counter() - started, operation=operation)
+
+    return asyncio.get_running_loop().run_in_executor(_hash_executor, timed_call)
+
+
+async def _run_in_hash_pool(operation: str, func, *args):
+    """Run a bcrypt call on the hashing pool, rejecting with 429 when the queue is full."""
+    global _pending
+    with _pending_lock:
+        if _pending >= HASH_MAX_PENDING:
+            hash_rejected_total.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": HASH_RETRY_AFTER_SECONDS},
+            )
+        _pending += 1
+
+    started = time.perf_counter()
+    try:
+        return await _submit_to_hash_pool(operation, func, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+        # Queue wait + bcrypt, as seen by the request awaiting it
+        record_request_time("bcrypt", time.perf_counter() - started)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a plain password on the hashing pool."""
+    return await _run_in_hash_pool("hash", hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password on the hashing pool."""
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords (bulk imports) through the same admission counter as single requests,
+    with at most HASH_BULK_CONCURRENCY jobs in flight so interactive logins still get workers.
+    A job turned away by a saturated pool waits and retries instead of failing the import.
+    """
+    async def hash_one(password: str) -> str:
+        async with _bulk_hash_slots:
+            while True:
+                try:
+                    return await _run_in_hash_pool("bulk_hash", hash_password, password)
+                except HTTPException as e:
+                    if e.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+                        raise
+                    await asyncio.sleep(float(HASH_RETRY_AFTER_SECONDS))
+
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+
+def hash_pool_stats() -> dict:
+    """Current hashing pool state and latency metrics."""
+    return {
+        "workers": HASH_WORKERS,
+        "max_pending": HASH_MAX_PENDING,
+        "pending": _pending,
+        "queue_wait_seconds": hash_queue_wait_seconds.snapshot(),
+        "hash_seconds": hash_duration_seconds.snapshot(),
+        "rejected": hash_rejected_total.snapshot(),
+    }
+
+
+def shutdown_hash_pool() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,128 @@
+from math import cos, floor, inf, radians, sqrt
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+Coordinates = Tuple[float, float]
+
+
+def parse_coordinates(location: Optional[str]) -> Optional[Coordinates]:
+    """Parse a "lat,lng" location string; anything else (e.g. a city name) returns None."""
+    if not location:
+        return None
+    parts = location.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lng = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    if -90 <= lat <= 90 and -180 <= lng <= 180:
+        return lat, lng
+    return None
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    # Equirectangular approximation: accurate to well under 1% at city scale and much cheaper than haversine
+    x = radians(lng2 - lng1) * cos(radians((lat1 + lat2) / 2))
+    y = radians(lat2 - lat1)
+    return EARTH_RADIUS_KM * sqrt(x * x + y * y)
+
+
+# ✅ Uniform lat/lng grid; nearest-neighbour search expands ring by ring from the query cell
+class GridIndex:
+    def __init__(self, cell_km: float = 2.0):
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Dict[int, Coordinates]] = {}
+        self._keys: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, lat: float, lng: float) -> Tuple[int, int]:
+        return floor(lat / self.cell_deg), floor(lng / self.cell_deg)
+
+    def insert(self, point_id: int, lat: float, lng: float) -> None:
+        if point_id in self._keys:
+            self.remove(point_id)
+        key = self._key(lat, lng)
+        self._cells.setdefault(key, {})[point_id] = (lat, lng)
+        self._keys[point_id] = key
+
+    def remove(self, point_id: int) -> None:
+        key = self._keys.pop(point_id, None)
+        if key is None:
+            return
+        cell = self._cells[key]
+        del cell[point_id]
+        if not cell:
+            del self._cells[key]
+
+    @staticmethod
+    def _ring(ci: int, cj: int, r: int) -> Iterator[Tuple[int, int]]:
+        if r == 0:
+            yield ci, cj
+            return
+        for dj in range(-r, r + 1):
+            yield ci - r, cj + dj
+            yield ci + r, cj + dj
+        for di in range(-r + 1, r):
+            yield ci + di, cj - r
+            yield ci + di, cj + r
+
+    def nearest(self, lat: float, lng: float, max_km: float = inf) -> Optional[Tuple[int, float]]:
+        """Closest point within max_km as (point_id, km), or None."""
+        if not self._keys:
+            return None
+        ci, cj = self._key(lat, lng)
+        # One cell step is narrowest along longitude; assume matches lie within ~1 degree of latitude
+        step_km = self.cell_deg * KM_PER_DEGREE * max(cos(radians(min(abs(lat) + 1, 89))), 0.01)
+        best, best_km = None, max_km
+        cells = self._cells
+
+        r = 0
+        while True:
+            for key in self._ring(ci, cj, r):
+                cell = cells.get(key)
+                if cell:
+                    for point_id, (plat, plng) in cell.items():
+                        km = distance_km(lat, lng, plat, plng)
+                        if km <= best_km:
+                            best, best_km = point_id, km
+            # Anything outside ring r is at least r cell steps away
+            if r * step_km >= best_km:
+                break
+            r += 1
+            if (2 * r + 1) ** 2 > len(cells):
+                # Sparse grid: cheaper to check the remaining occupied cells directly
+                for (ki, kj), cell in cells.items():
+                    if max(abs(ki - ci), abs(kj - cj)) < r:
+                        continue
+                    for point_id, (plat, plng) in cell.items():
+                        km = distance_km(lat, lng, plat, plng)
+                        if km <= best_km:
+                            best, best_km = point_id, km
+                break
+        return None if best is None else (best, best_km)
+
+
+def greedy_assign(
+    requests: Iterable[Tuple[int, float, float]],
+    index: GridIndex,
+    max_km: float = inf,
+) -> List[Tuple[int, int, float]]:
+    """
+    Match each request (in the given order, e.g. oldest first) to its nearest remaining point.
+    Returns (request_id, point_id, km); matched points are removed from the index.
+    """
+    matches = []
+    for request_id, lat, lng in requests:
+        if not index:
+            break
+        hit = index.nearest(lat, lng, max_km)
+        if hit is not None:
+            point_id, km = hit
+            index.remove(point_id)
+            matches.append((request_id, point_id, km))
+    return matches
@@ -0,0 +1,178 @@
+import os
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ✅ Default thresholds (per-patient overrides live in vitals_thresholds)
+VITALS_SPO2_MIN = float(os.getenv("VITALS_SPO2_MIN", "90"))
+VITALS_HR_MAX = int(os.getenv("VITALS_HR_MAX", "120"))
+VITALS_HR_SUSTAINED_SECONDS = float(os.getenv("VITALS_HR_SUSTAINED_SECONDS", "60"))
+# Consecutive low SpO2 readings before alerting, so a single sensor glitch is ignored
+VITALS_SPO2_CONSECUTIVE = int(os.getenv("VITALS_SPO2_CONSECUTIVE", "2"))
+# Same alert type is not raised again for a patient within this many seconds (reading time)
+VITALS_ALERT_COOLDOWN_SECONDS = float(os.getenv("VITALS_ALERT_COOLDOWN_SECONDS", "300"))
+# Heart-rate readings kept per patient; must cover VITALS_HR_SUSTAINED_SECONDS at the device rate
+VITALS_RULE_WINDOW_CAPACITY = int(os.getenv("VITALS_RULE_WINDOW_CAPACITY", "32"))
+
+ALERT_TYPE_LOW_SPO2 = "low_spo2"
+ALERT_TYPE_SUSTAINED_HIGH_HR = "sustained_high_heart_rate"
+
+# (patient_id, alert_type, recorded_at, value)
+AlertEvent = Tuple[int, str, datetime, float]
+
+
+class VitalsThresholds:
+    __slots__ = ("spo2_min", "hr_max", "hr_sustained_seconds")
+
+    def __init__(
+        self,
+        spo2_min: float = VITALS_SPO2_MIN,
+        hr_max: int = VITALS_HR_MAX,
+        hr_sustained_seconds: float = VITALS_HR_SUSTAINED_SECONDS,
+    ):
+        self.spo2_min = spo2_min
+        self.hr_max = hr_max
+        self.hr_sustained_seconds = hr_sustained_seconds
+
+
+class PatientVitalsWindow:
+    """
+    Per-patient rule state. Heart-rate readings are kept in a fixed-size ring buffer
+    (timestamps in a float array, above/below flags in a bytearray) together with a
+    running count of below-threshold entries, so each reading is O(1) amortized.
+    """
+
+    __slots__ = (
+        "times", "high", "head", "size", "low_count", "covered_from", "dip_until",
+        "spo2_low_streak", "last_spo2_alert_at", "last_hr_alert_at",
+    )
+
+    def __init__(self, capacity: int = VITALS_RULE_WINDOW_CAPACITY):
+        self.times = array("d", bytes(8 * capacity))
+        self.high = bytearray(capacity)
+        self.head = 0
+        self.size = 0
+        self.low_count = 0
+        # Earliest time the window has continuous data for
+        self.covered_from = float("inf")
+        # Latest time a below-threshold reading evicted for capacity was still in effect
+        self.dip_until = float("-inf")
+        self.spo2_low_streak = 0
+        self.last_spo2_alert_at = float("-inf")
+        self.last_hr_alert_at = float("-inf")
+
+    @property
+    def last_seen(self) -> float:
+        if not self.size:
+            return float("-inf")
+        return self.times[(self.head + self.size - 1) % len(self.high)]
+
+    def _reset(self) -> None:
+        self.head = self.size = self.low_count = 0
+        self.covered_from = float("inf")
+        self.dip_until = float("-inf")
+
+    def _pop_oldest(self) -> None:
+        capacity = len(self.high)
+        head = self.head
+        self.head = (head + 1) % capacity
+        self.size -= 1
+        if not self.high[head]:
+            self.low_count -= 1
+            # A reading stays in effect until the next one arrives
+            if self.size and self.times[self.head] > self.dip_until:
+                self.dip_until = self.times[self.head]
+
+    def push_heart_rate(self, ts: float, is_high: bool, window: float) -> bool:
+        """Record a reading; True when the heart rate has been high for the whole last `window` seconds."""
+        times = self.times
+        capacity = len(times)
+        if self.size:
+            last = times[(self.head + self.size - 1) % capacity]
+            if ts < last:
+                return False  # out of order; ignore for the window
+            if ts - last > window:
+                self._reset()  # gap in the data, nothing can be "sustained" across it
+
+        cutoff = ts - window
+        # Keep the newest entry at or before the cutoff: it is what was in effect at the window start
+        while self.size > 1 and times[(self.head + 1) % capacity] <= cutoff:
+            self._pop_oldest()
+        if self.size == capacity:
+            self._pop_oldest()
+
+        if not self.size:
+            self.covered_from = ts
+        tail = (self.head + self.size) % capacity
+        times[tail] = ts
+        self.high[tail] = is_high
+        self.size += 1
+        if not is_high:
+            self.low_count += 1
+        return self.low_count == 0 and self.covered_from <= cutoff and self.dip_until <= cutoff
+
+
+class VitalsRuleEngine:
+    """Evaluates ingestion rows (patient_id, heart_rate, spo2, temperature, recorded_at) against thresholds."""
+
+    def __init__(
+        self,
+        defaults: Optional[VitalsThresholds] = None,
+        window_capacity: int = VITALS_RULE_WINDOW_CAPACITY,
+        cooldown_seconds: float = VITALS_ALERT_COOLDOWN_SECONDS,
+        spo2_consecutive: int = VITALS_SPO2_CONSECUTIVE,
+    ):
+        self.defaults = defaults or VitalsThresholds()
+        self.window_capacity = window_capacity
+        self.cooldown_seconds = cooldown_seconds
+        self.spo2_consecutive = spo2_consecutive
+        self.thresholds: Dict[int, VitalsThresholds] = {}
+        self.windows: Dict[int, PatientVitalsWindow] = {}
+
+    def set_thresholds(self, thresholds: Dict[int, VitalsThresholds]) -> None:
+        self.thresholds = thresholds
+
+    def evaluate(self, rows: Iterable[Tuple]) -> List[AlertEvent]:
+        # Hot loop: attribute lookups hoisted into locals
+        alerts: List[AlertEvent] = []
+        windows = self.windows
+        thresholds = self.thresholds
+        defaults = self.defaults
+        capacity = self.window_capacity
+        cooldown = self.cooldown_seconds
+        spo2_consecutive = self.spo2_consecutive
+
+        for patient_id, heart_rate, spo2, _temperature, recorded_at in rows:
+            window = windows.get(patient_id)
+            if window is None:
+                window = windows[patient_id] = PatientVitalsWindow(capacity)
+            limits = thresholds.get(patient_id, defaults)
+            ts = recorded_at.timestamp()
+
+            if spo2 is not None:
+                if spo2 < limits.spo2_min:
+                    window.spo2_low_streak += 1
+                    if window.spo2_low_streak >= spo2_consecutive and ts - window.last_spo2_alert_at >= cooldown:
+                        window.last_spo2_alert_at = ts
+                        alerts.append((patient_id, ALERT_TYPE_LOW_SPO2, recorded_at, spo2))
+                else:
+                    window.spo2_low_streak = 0
+
+            if heart_rate is not None:
+                sustained = window.push_heart_rate(ts, heart_rate > limits.hr_max, limits.hr_sustained_seconds)
+                if sustained and ts - window.last_hr_alert_at >= cooldown:
+                    window.last_hr_alert_at = ts
+                    alerts.append((patient_id, ALERT_TYPE_SUSTAINED_HIGH_HR, recorded_at, heart_rate))
+        return alerts
+
+    def evict_idle(self, older_than: float) -> int:
+        """Forget patients whose last heart-rate reading is older than `older_than` (epoch seconds)."""
+        idle = [
+            patient_id for patient_id, window in self.windows.items()
+            if window.last_seen < older_than
+            and window.last_spo2_alert_at < older_than
+            and window.last_hr_alert_at < older_than
+        ]
+        for patient_id in idle:
+            del self.windows[patient_id]
+        return len(idle)
@@ -0,0 +1,69 @@
+"""
+Throughput of the in-process vitals rule engine (single core, no database).
+
+Run from the backend directory:
+    python benchmarks/bench_alert_rules.py [readings] [patients]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("VITALS_SPO2_MIN", "90")
+os.environ.setdefault("VITALS_HR_MAX", "120")
+os.environ.setdefault("VITALS_HR_SUSTAINED_SECONDS", "60")
+os.environ.setdefault("VITALS_RULE_WINDOW_CAPACITY", "32")
+
+from app.utils.vitals_rules import VitalsRuleEngine
+
+TARGET_READINGS_PER_SECOND = 100_000
+
+
+def make_rows(readings: int, patients: int):
+    """Interleaved readings, one per patient every 5s; ~2% of patients run tachycardic."""
+    rng = random.Random(42)
+    start = datetime.now(UTC) - timedelta(hours=1)
+    tachycardic = set(rng.sample(range(1, patients + 1), max(1, patients // 50)))
+    rows = []
+    for i in range(readings):
+        patient_id = i % patients + 1
+        recorded_at = start + timedelta(seconds=5 * (i // patients))
+        base = 135 if patient_id in tachycardic else 80
+        rows.append((
+            patient_id,
+            base + rng.randint(-10, 10),
+            rng.choice((97.0, 98.0, 99.0, 88.0)) if rng.random() < 0.01 else 97.0,
+            36.8,
+            recorded_at,
+        ))
+    return rows
+
+
+def main(readings: int = 1_000_000, patients: int = 10_000):
+    rows = make_rows(readings, patients)
+    engine = VitalsRuleEngine()
+
+    # Evaluate in ingestion-sized batches, like the vitals flusher does
+    batch_size = 5000
+    alerts = 0
+    started = time.perf_counter()
+    for offset in range(0, len(rows), batch_size):
+        alerts += len(engine.evaluate(rows[offset:offset + batch_size]))
+    elapsed = time.perf_counter() - started
+
+    rate = readings / elapsed
+    print(f"readings:          {readings}")
+    print(f"patients:          {patients}")
+    print(f"alerts raised:     {alerts}")
+    print(f"elapsed:           {elapsed:8.3f} s")
+    print(f"throughput:        {rate:,.0f} readings/s (target {TARGET_READINGS_PER_SECOND:,})")
+    print(f"per reading:       {elapsed / readings * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
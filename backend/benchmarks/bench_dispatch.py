@@ -0,0 +1,68 @@
+"""
+Greedy nearest-driver assignment with the grid index vs. a brute-force scan.
+
+Run from the backend directory:
+    python benchmarks/bench_dispatch.py [drivers] [orders]
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DISPATCH_GRID_CELL_KM", "2")
+
+from app.utils.spatial import GridIndex, distance_km, greedy_assign
+
+# Roughly the Mumbai metro area
+LAT_RANGE = (18.90, 19.30)
+LNG_RANGE = (72.75, 73.10)
+BRUTE_FORCE_SAMPLE = 500
+
+
+def random_points(count: int, rng: random.Random):
+    return [(i + 1, rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for i in range(count)]
+
+
+def brute_force_nearest(drivers, lat, lng):
+    return min(drivers.items(), key=lambda item: distance_km(lat, lng, *item[1]))
+
+
+def main(driver_count: int = 10_000, order_count: int = 50_000):
+    rng = random.Random(7)
+    drivers = random_points(driver_count, rng)
+    orders = random_points(order_count, rng)
+    cell_km = float(os.environ["DISPATCH_GRID_CELL_KM"])
+
+    started = time.perf_counter()
+    index = GridIndex(cell_km=cell_km)
+    for driver_id, lat, lng in drivers:
+        index.insert(driver_id, lat, lng)
+    built = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matches = greedy_assign(orders, index)
+    assigned = time.perf_counter() - started
+
+    # Same greedy matching with a linear scan, on a sample, to check results and extrapolate cost
+    remaining = {driver_id: (lat, lng) for driver_id, lat, lng in drivers}
+    started = time.perf_counter()
+    for (order_id, lat, lng), (_, matched_driver, _) in zip(orders[:BRUTE_FORCE_SAMPLE], matches):
+        driver_id, _ = brute_force_nearest(remaining, lat, lng)
+        assert driver_id == matched_driver, "grid index disagrees with brute force"
+        del remaining[driver_id]
+    brute = (time.perf_counter() - started) / BRUTE_FORCE_SAMPLE * min(order_count, driver_count)
+
+    print(f"drivers / orders:  {driver_count} / {order_count}")
+    print(f"assigned:          {len(matches)}")
+    print(f"index build:       {built * 1000:8.1f} ms")
+    print(f"grid assignment:   {assigned * 1000:8.1f} ms")
+    print(f"brute force (est): {brute * 1000:8.1f} ms (extrapolated from the first {BRUTE_FORCE_SAMPLE} orders)")
+    print(f"speedup:           {brute / assigned:8.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,43 @@
+"""
+Per-request JWT verification cost, uncached vs. cached.
+
+Run from the backend directory:
+    python benchmarks/bench_jwt_decode.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from jose import jwt
+
+from app.utils.jwt_token import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    decode_jwt_token,
+    verified_token_cache,
+)
+
+
+def main(iterations: int = 50_000):
+    token = create_access_token(username="bench@example.com", user_id=1)
+
+    uncached = timeit.timeit(lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), number=iterations)
+
+    verified_token_cache.clear()
+    decode_jwt_token(token)  # warm the cache
+    cached = timeit.timeit(lambda: decode_jwt_token(token), number=iterations)
+
+    print(f"iterations:        {iterations}")
+    print(f"jwt.decode:        {uncached / iterations * 1e6:8.2f} us/request")
+    print(f"decode_jwt_token:  {cached / iterations * 1e6:8.2f} us/request (cached)")
+    print(f"speedup:           {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
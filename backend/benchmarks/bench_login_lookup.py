@@ -0,0 +1,96 @@
+"""
+Login lookup on a large users table: the old OR query vs. the classified,
+single-column lookup used by auth_login_service.
+
+Seeds a TEMP copy of `users` (same indexes, nothing touches the real table)
+with N rows and times random lookups. Needs the same DB_*_1 env as the app.
+
+Run from the backend directory:
+    python benchmarks/bench_login_lookup.py [rows] [lookups]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+
+from app.db.database import engine
+import app.models.auth_models  # noqa: F401  (registers the users indexes)
+from app.services.auth_services import classify_login_identifier
+
+
+SEED_SQL = """
+INSERT INTO bench_users (id, email, hashed_password, username, phone, role_id, is_active)
+SELECT g,
+       'user' || g || '@example.com',
+       'x',
+       'user_' || g,
+       '+91' || lpad(g::text, 10, '0'),
+       3,
+       g % 20 <> 0
+FROM generate_series(1, :rows) AS g
+"""
+
+OLD_QUERY = text("""
+SELECT id FROM bench_users
+WHERE (email = :identifier OR username = :identifier OR phone = :identifier)
+  AND is_active = true
+LIMIT 1
+""")
+
+NEW_QUERIES = {
+    "email": text("SELECT id FROM bench_users WHERE lower(email) = :identifier AND is_active = true LIMIT 1"),
+    "phone": text("SELECT id FROM bench_users WHERE phone = :identifier AND is_active = true LIMIT 1"),
+    "username": text("SELECT id FROM bench_users WHERE lower(username) = :identifier AND is_active = true LIMIT 1"),
+}
+
+
+def sample_identifiers(rows: int, lookups: int):
+    identifiers = []
+    for _ in range(lookups):
+        g = random.randint(1, rows)
+        identifiers.append(random.choice([
+            f"user{g}@example.com",
+            f"user_{g}",
+            "+91" + str(g).zfill(10),
+        ]))
+    return identifiers
+
+
+def timed(conn, identifiers, query_for):
+    started = time.perf_counter()
+    for identifier in identifiers:
+        conn.execute(query_for(identifier), {"identifier": identifier}).first()
+    return (time.perf_counter() - started) / len(identifiers)
+
+
+def main(rows: int = 1_000_000, lookups: int = 2_000):
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE TEMP TABLE bench_users (LIKE users INCLUDING DEFAULTS INCLUDING INDEXES)"
+        ))
+        print(f"seeding {rows} users ...")
+        conn.execute(text(SEED_SQL), {"rows": rows})
+        conn.execute(text("ANALYZE bench_users"))
+
+        identifiers = sample_identifiers(rows, lookups)
+        old = timed(conn, identifiers, lambda identifier: OLD_QUERY)
+        new = timed(
+            conn,
+            [identifier.lower() for identifier in identifiers],
+            lambda identifier: NEW_QUERIES[classify_login_identifier(identifier)],
+        )
+
+        plan = conn.execute(text("EXPLAIN " + str(OLD_QUERY)), {"identifier": identifiers[0]}).scalars().all()
+        print("old plan:\n  " + "\n  ".join(plan))
+        print(f"old OR lookup:        {old * 1e3:8.3f} ms/login")
+        print(f"classified lookup:    {new * 1e3:8.3f} ms/login")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,15 +1,27 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
 
-from app.api.routes import auth_routes, dashboard_routes
+from app.api.routes import auth_routes, appointment_routes, dashboard_routes, internal_routes, order_routes, user_routes, vitals_routes
 
 
 
 load_dotenv()
 # Database
-from app.db.database import Base, engine
+from app.db.database import Base, engine, async_engine
+import app.models.care_models  # noqa: F401  (register tables for create_all)
+import app.models.dashboard_models  # noqa: F401
+import app.models.vitals_models  # noqa: F401
+from app.utils.security import shutdown_hash_pool
+from app.utils.metrics import render_prometheus
+from app.utils.request_metrics import RequestMetricsMiddleware, require_metrics_access
+from app.services.role_services import preload_roles_cache
+from app.services.vitals_services import vitals_buffer
+from app.services.vitals_storage_services import vitals_rollup_job
+from app.services.alert_services import alert_writer
+from app.services.dispatch_services import order_dispatcher
 
 
 
@@ -23,6 +35,46 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
 
 
+@app.on_event("startup")
+async def preload_caches():
+    await preload_roles_cache()
+
+
+@app.on_event("startup")
+async def start_vitals_ingestion():
+    await vitals_buffer.start()
+    await vitals_rollup_job.start()
+    await alert_writer.start()
+
+
+@app.on_event("startup")
+async def start_order_dispatcher():
+    await order_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_vitals_ingestion():
+    # Drain buffered readings before the engine is disposed
+    await vitals_buffer.stop()
+    await vitals_rollup_job.stop()
+    await alert_writer.stop()
+
+
+@app.on_event("shutdown")
+async def stop_order_dispatcher():
+    await order_dispatcher.stop()
+
+
+@app.on_event("shutdown")
+def stop_hash_pool():
+    shutdown_hash_pool()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
+
 
 
 # Enable CORS for frontend
@@ -32,7 +84,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Outermost, so latency includes CORS handling
+app.add_middleware(RequestMetricsMiddleware)
 
 
 # Health check endpoint
@@ -40,6 +95,17 @@ app.add_middleware(
 def health_check():
     return {"message": "🚀 FastAPI backend is running"}
 
+# Prometheus scrape endpoint (latency histograms, DB/bcrypt/JWT time, pools, ingestion)
+# Requires METRICS_TOKEN as a bearer token when set, otherwise a client in METRICS_ALLOWED_NETWORKS (loopback by default)
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 # Register all routers 
 app.include_router(auth_routes.router, prefix="/api", tags=["Auth"])
 app.include_router(dashboard_routes.router, prefix="/api", tags=["Dashboard"])
+app.include_router(vitals_routes.router, prefix="/api", tags=["Vitals"])
+app.include_router(appointment_routes.router, prefix="/api", tags=["Appointments"])
+app.include_router(order_routes.router, prefix="/api", tags=["Orders"])
+app.include_router(user_routes.router, prefix="/api", tags=["Users"])
+app.include_router(internal_routes.router, prefix="/api", tags=["Internal"])
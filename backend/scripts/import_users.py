@@ -0,0 +1,52 @@
+"""
+Bulk-import users (clinic onboarding) from a CSV or JSONL file.
+
+Columns/keys match the registration payload: email, password, username, phone,
+role, location, license_number, specialization, pharmacy_name, vehicle_number.
+Prints one JSON result per row, then a summary line.
+
+Run from the backend directory:
+    python scripts/import_users.py staff.csv
+    python scripts/import_users.py staff.jsonl --format jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.database import AsyncSessionLocal, async_engine
+from app.services.user_import_services import (
+    SUPPORTED_IMPORT_FORMATS,
+    detect_import_format,
+    import_users_service,
+    parse_import_rows,
+)
+
+
+async def run(path: Path, fmt: str) -> int:
+    failed = 0
+    with path.open(encoding="utf-8-sig", newline="") as handle:
+        async with AsyncSessionLocal() as db:
+            async for outcome in import_users_service(db, parse_import_rows(handle, fmt)):
+                print(json.dumps(outcome), flush=True)
+                failed = outcome.get("summary", {}).get("failed", failed)
+    await async_engine.dispose()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import users from CSV or JSONL")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=SUPPORTED_IMPORT_FORMATS)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_import_format(args.path.name)
+    sys.exit(asyncio.run(run(args.path, fmt)))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ import {
   PlusCircle, // For adding new patient
   Settings // For settings
 } from 'lucide-react';
+import { useDashboardSocket } from '../../utils/useDashboardSocket';
 
 // Mock API utility to simulate data fetching
 const mockFetchDashboardData = () => {
@@ -204,6 +205,10 @@ const DoctorDashboard: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  // live alerts and vitals for the doctor's patients, pushed by the backend
+  const authToken = localStorage.getItem("auth_token") || "";
+  const { connected, latestVitals, alerts: liveAlerts } = useDashboardSocket(authToken);
+
   useEffect(() => {
     const loadDashboardData = async () => {
       try {
@@ -322,6 +327,10 @@ const DoctorDashboard: React.FC = () => {
                 <div className="w-2 h-2 bg-green-500 rounded-full"></div>
                 <span className="text-sm font-medium">Available</span>
               </div>
+             <div className={`flex items-center space-x-2 px-3 py-1 rounded-full ${connected ? 'bg-green-100 text-green-800' : 'bg-gray-100 text-gray-600'}`}>
+                <div className={`w-2 h-2 rounded-full ${connected ? 'bg-green-500' : 'bg-gray-400'}`}></div>
+                <span className="text-sm font-medium">{connected ? 'Live' : 'Offline'}</span>
+              </div>
           </div>
         </header>
 
@@ -344,6 +353,35 @@ const DoctorDashboard: React.FC = () => {
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
           {/* Left Column: Patient Monitoring & Emergency Alerts */}
           <div className="lg:col-span-2 space-y-6">
+            {/* Live Alerts (WebSocket) */}
+            {liveAlerts.length > 0 && (
+              <section className="bg-white p-6 rounded-2xl shadow-lg">
+                <h2 className="text-2xl font-bold text-gray-800 flex items-center mb-4">
+                  <Activity className="h-6 w-6 mr-3 text-red-500" />Live Alerts
+                </h2>
+                <div className="space-y-3">
+                  {liveAlerts.map((alert, idx) => {
+                    const vitals = latestVitals[alert.patient_id];
+                    return (
+                      <div key={`${alert.patient_id}-${alert.timestamp}-${idx}`} className="flex flex-wrap items-center justify-between gap-2 border border-red-200 rounded-xl p-4 bg-red-50">
+                        <div>
+                          <p className="font-semibold text-red-800">{alert.alert_type} for patient #{alert.patient_id}</p>
+                          <p className="text-sm text-red-600">Value {alert.value ?? '-'} at {new Date(alert.timestamp).toLocaleTimeString()}</p>
+                        </div>
+                        {vitals && (
+                          <div className="flex items-center gap-4 text-sm text-gray-700">
+                            <span className="flex items-center"><Heart className="h-4 w-4 mr-1 text-red-500" />{vitals.heart_rate ?? '-'} BPM</span>
+                            <span className="flex items-center"><Activity className="h-4 w-4 mr-1 text-blue-500" />{vitals.spo2 ?? '-'}% SpO2</span>
+                            <span className="flex items-center"><Thermometer className="h-4 w-4 mr-1 text-orange-500" />{vitals.temperature ?? '-'}°</span>
+                          </div>
+                        )}
+                      </div>
+                    );
+                  })}
+                </div>
+              </section>
+            )}
+
             {/* Emergency Alerts */}
             <section className="bg-white p-6 rounded-2xl shadow-lg">
               <div className="flex items-center justify-between mb-6">
@@ -1,14 +1,41 @@
-import React, { useEffect, useState } from 'react';
+import React from 'react';
+import { Activity, AlertCircle, Heart, Thermometer } from 'lucide-react';
 
 import StreamlitDashboard from './StreamlitDashboard';
+import { useDashboardSocket } from '../../utils/useDashboardSocket';
 
 
 const PatientDashboard: React.FC = () => {
+  const authToken = localStorage.getItem("auth_token") || "";
+  // live readings and alerts pushed by the backend (no polling)
+  const { connected, latestVitals, alerts } = useDashboardSocket(authToken);
+  const vitals = Object.values(latestVitals)[0];
+
   return(
     <>
+      <div className="flex flex-wrap items-center gap-4 bg-white px-6 py-3 shadow-sm">
+        <div className={`flex items-center space-x-2 px-3 py-1 rounded-full text-sm font-medium ${connected ? 'bg-green-100 text-green-800' : 'bg-gray-100 text-gray-600'}`}>
+          <div className={`w-2 h-2 rounded-full ${connected ? 'bg-green-500' : 'bg-gray-400'}`}></div>
+          <span>{connected ? 'Live' : 'Offline'}</span>
+        </div>
+        {vitals && (
+          <>
+            <span className="flex items-center text-gray-700"><Heart className="h-4 w-4 mr-1 text-red-500" />{vitals.heart_rate ?? '-'} BPM</span>
+            <span className="flex items-center text-gray-700"><Activity className="h-4 w-4 mr-1 text-blue-500" />{vitals.spo2 ?? '-'}% SpO2</span>
+            <span className="flex items-center text-gray-700"><Thermometer className="h-4 w-4 mr-1 text-orange-500" />{vitals.temperature ?? '-'}°</span>
+            <span className="text-sm text-gray-500">{new Date(vitals.timestamp).toLocaleTimeString()}</span>
+          </>
+        )}
+        {alerts.length > 0 && (
+          <span className="flex items-center bg-red-100 text-red-800 px-3 py-1 rounded-full text-sm font-medium">
+            <AlertCircle className="h-4 w-4 mr-1" />
+            {alerts[0].alert_type} ({alerts[0].value ?? '-'}) at {new Date(alerts[0].timestamp).toLocaleTimeString()}
+          </span>
+        )}
+      </div>
       <StreamlitDashboard/>
     </>
   )
 };
 
-export default PatientDashboard;
\ No newline at end of file
+export default PatientDashboard;
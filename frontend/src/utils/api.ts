@@ -74,3 +74,29 @@ export const fetchDashboardData = async(authToken : string) => {
 
   return await handleResponse(res);
 }
+
+
+// live dashboard updates (alerts + vitals) pushed over a WebSocket instead of polling
+export type DashboardSocketMessage = {
+  type: "dashboard" | "vitals" | "alert";
+  topic?: string;
+  [key: string]: unknown;
+};
+
+export const openDashboardSocket = (
+  authToken: string,
+  onMessage: (message: DashboardSocketMessage) => void,
+): WebSocket => {
+  const wsBaseUrl = API_BASE_URL.replace(/^http/, "ws");
+  const socket = new WebSocket(`${wsBaseUrl}/ws/dashboard?token=${encodeURIComponent(authToken)}`);
+
+  socket.onmessage = (event) => {
+    try {
+      onMessage(JSON.parse(event.data) as DashboardSocketMessage);
+    } catch {
+      // ignore malformed frames
+    }
+  };
+
+  return socket;
+};
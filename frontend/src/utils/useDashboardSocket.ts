@@ -0,0 +1,68 @@
+import { useEffect, useState } from "react";
+import { openDashboardSocket, DashboardSocketMessage } from "./api";
+
+// Keep only the most recent alerts in memory
+const MAX_LIVE_ALERTS = 20;
+const RECONNECT_DELAY_MS = 5000;
+
+export type LiveVitals = {
+  patient_id: number;
+  heart_rate: number | null;
+  spo2: number | null;
+  temperature: number | null;
+  timestamp: string;
+};
+
+export type LiveAlert = {
+  patient_id: number;
+  alert_type: string;
+  value: number | null;
+  timestamp: string;
+};
+
+// live dashboard state from /ws/dashboard; reconnects after the socket closes
+export const useDashboardSocket = (authToken: string) => {
+  const [connected, setConnected] = useState(false);
+  const [snapshot, setSnapshot] = useState<DashboardSocketMessage | null>(null);
+  const [latestVitals, setLatestVitals] = useState<Record<number, LiveVitals>>({});
+  const [alerts, setAlerts] = useState<LiveAlert[]>([]);
+
+  useEffect(() => {
+    if (!authToken) return;
+
+    let socket: WebSocket | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let closedByUs = false;
+
+    const connect = () => {
+      socket = openDashboardSocket(authToken, (message) => {
+        if (message.type === "dashboard") {
+          setSnapshot(message);
+        } else if (message.type === "vitals") {
+          const vitals = message as unknown as LiveVitals;
+          setLatestVitals((prev) => ({ ...prev, [vitals.patient_id]: vitals }));
+        } else if (message.type === "alert") {
+          const alert = message as unknown as LiveAlert;
+          setAlerts((prev) => [alert, ...prev].slice(0, MAX_LIVE_ALERTS));
+        }
+      });
+      socket.onopen = () => setConnected(true);
+      socket.onclose = () => {
+        setConnected(false);
+        if (!closedByUs) {
+          reconnectTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+        }
+      };
+    };
+
+    connect();
+
+    return () => {
+      closedByUs = true;
+      clearTimeout(reconnectTimer);
+      socket?.close();
+    };
+  }, [authToken]);
+
+  return { connected, snapshot, latestVitals, alerts };
+};
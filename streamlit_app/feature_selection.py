@@ -0,0 +1,166 @@
+"""
+Feature-selection helpers for the activity-recognition app (correlation pruning, VIF, importances).
+Kept free of Streamlit/TensorFlow so the benchmarks can import them directly.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesClassifier
+from sklearn.model_selection import train_test_split
+
+# Columns per block of the correlation matmul (bounds the temporary to n_features x CORR_BLOCK_SIZE)
+CORR_BLOCK_SIZE = 256
+
+# Added to the correlation diagonal before inverting; caps the VIF of exactly collinear features near 1 / VIF_RIDGE
+VIF_RIDGE = 1e-8
+
+# Rebuild the inverse from scratch every this many rank-one downdates to stop rounding error accumulating
+VIF_REFRESH_EVERY = 50
+
+# Feature-importance estimate: stratified row sample and a small, depth-capped ExtraTrees forest
+IMPORTANCE_SAMPLE_SIZE = 3000
+IMPORTANCE_N_ESTIMATORS = 100
+IMPORTANCE_MAX_DEPTH = 12
+
+
+def to_float32_matrix(X):
+    """
+    Row-major float32 feature matrix. DataFrames are copied column by column into one
+    preallocated array, so no float64 or second full-size intermediate is created.
+    """
+    if isinstance(X, pd.DataFrame):
+        matrix = np.empty(X.shape, dtype=np.float32)
+        for i, (_, column) in enumerate(X.items()):
+            matrix[:, i] = column.to_numpy()
+        return matrix
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+def unit_columns(X, dtype=np.float32):
+    """
+    Centre each column and scale it to unit L2 norm, so that Z.T @ Z is the correlation matrix.
+    Constant columns become all zeros, i.e. uncorrelated with everything.
+    """
+    Z = to_float32_matrix(X)
+    if dtype != np.float32:
+        Z = Z.astype(dtype)
+    Z -= Z.mean(axis=0, dtype=np.float64).astype(dtype)
+    norms = np.sqrt(np.einsum('ij,ij->j', Z, Z, dtype=np.float64))
+    norms[norms == 0] = np.inf
+    Z *= (1.0 / norms).astype(dtype)
+    return Z
+
+
+# ---- Correlation pruning ----
+
+def max_upper_correlation(X, block_size=CORR_BLOCK_SIZE):
+    """For each column j, max |corr(i, j)| over the earlier columns i < j (0 for the first column)"""
+    Z = unit_columns(X)
+    n_features = Z.shape[1]
+    max_corr = np.zeros(n_features, dtype=np.float32)
+    for start in range(0, n_features, block_size):
+        stop = min(start + block_size, n_features)
+        # Rows 0..stop-1 against columns start..stop-1: the only part of the upper triangle these columns need
+        block = np.abs(Z[:, :stop].T @ Z[:, start:stop])
+        # Zero the diagonal and lower triangle (rows i >= j)
+        block[np.tril_indices(stop, k=-start, m=stop - start)] = 0
+        max_corr[start:stop] = block.max(axis=0)
+    return np.minimum(max_corr, 1.0)
+
+
+def max_upper_correlation_pandas(X):
+    """Same result via pairwise-complete pandas corr, used when the data has missing values"""
+    corr = np.abs(X.corr().to_numpy())
+    upper = np.where(np.triu(np.ones(corr.shape, dtype=bool), k=1), corr, 0)
+    return np.nan_to_num(upper, nan=0.0).max(axis=0, initial=0.0)
+
+
+# ---- Variance inflation factors ----
+
+def correlation_matrix(X):
+    """float64 correlation matrix; pairwise-complete pandas corr when a DataFrame has missing values"""
+    if isinstance(X, pd.DataFrame) and X.isna().to_numpy().any():
+        corr = np.nan_to_num(X.corr().to_numpy(dtype=np.float64), nan=0.0)
+    else:
+        Z = unit_columns(X, dtype=np.float64)
+        corr = Z.T @ Z
+    # Constant columns get a unit diagonal (VIF 1) rather than a singular row
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def _regularized_inverse(corr, ridge):
+    return np.linalg.inv(corr + ridge * np.eye(len(corr)))
+
+
+def vif_scores(X, ridge=VIF_RIDGE):
+    """
+    VIF of every column in one shot: VIF_j = (R^-1)_jj for the correlation matrix R,
+    which equals 1 / (1 - R^2_j) from regressing column j on all others with an intercept.
+    """
+    return np.diag(_regularized_inverse(correlation_matrix(X), ridge)).copy()
+
+
+def iterative_vif_elimination(X, threshold, ridge=VIF_RIDGE, refresh_every=VIF_REFRESH_EVERY):
+    """
+    Repeatedly drop the column with the highest VIF until every remaining VIF is <= threshold.
+    Removing column k updates the inverse with a rank-one downdate (P -= P[:, k] P[k, :] / P_kk),
+    O(p^2) per step instead of a new O(p^3) inversion.
+
+    Returns (dropped mask, VIF per column): the VIF when a column was dropped, the final VIF otherwise.
+    """
+    corr = correlation_matrix(X)
+    inverse = _regularized_inverse(corr, ridge)
+    dropped = np.zeros(len(corr), dtype=bool)
+    vif = np.diag(inverse).copy()
+
+    steps = 0
+    while not dropped.all():
+        current = np.where(dropped, -np.inf, np.diag(inverse))
+        worst = int(np.argmax(current))
+        if current[worst] <= threshold:
+            break
+        vif[worst] = current[worst]
+        dropped[worst] = True
+        steps += 1
+
+        if steps % refresh_every == 0:
+            keep = np.flatnonzero(~dropped)
+            inverse = np.zeros_like(inverse)
+            inverse[np.ix_(keep, keep)] = _regularized_inverse(corr[np.ix_(keep, keep)], ridge)
+        else:
+            pivot = inverse[:, worst].copy()
+            inverse -= np.outer(pivot, pivot) / pivot[worst]
+
+    vif[~dropped] = np.diag(inverse)[~dropped]
+    return dropped, vif
+
+
+# ---- Feature importance ----
+
+def stratified_sample(X, y, size, random_state=42):
+    """At most `size` rows with the class proportions of y (plain random sample if a class is too small)"""
+    if len(X) <= size:
+        return X, y
+    try:
+        X_sample, _, y_sample, _ = train_test_split(X, y, train_size=size, stratify=y, random_state=random_state)
+    except ValueError:
+        X_sample, _, y_sample, _ = train_test_split(X, y, train_size=size, random_state=random_state)
+    return X_sample, y_sample
+
+
+def feature_importance(X, y, sample_size=IMPORTANCE_SAMPLE_SIZE, n_estimators=IMPORTANCE_N_ESTIMATORS,
+                       max_depth=IMPORTANCE_MAX_DEPTH, random_state=42):
+    """Impurity importances from ExtraTrees on a stratified subsample, sorted descending"""
+    X_sample, y_sample = stratified_sample(X, y, sample_size, random_state)
+    model = ExtraTreesClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        random_state=random_state,
+        n_jobs=-1
+    )
+    model.fit(X_sample, y_sample)
+    return pd.DataFrame({
+        'Feature': X.columns,
+        'Importance': model.feature_importances_
+    }).sort_values('Importance', ascending=False, ignore_index=True)
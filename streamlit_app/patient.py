@@ -15,6 +15,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
 import os
+import sys
 import xgboost as xgb
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, precision_score, recall_score, \
     f1_score
@@ -26,15 +27,30 @@ from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.losses import SparseCategoricalCrossentropy
 from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
 from sklearn.pipeline import Pipeline
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 import hashlib
 import glob
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 from imblearn.pipeline import Pipeline as ImbPipeline
 from sklearn.ensemble import RandomForestClassifier
 from imblearn.over_sampling import SMOTE
 from sklearn.metrics import make_scorer, balanced_accuracy_score
 import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from feature_selection import (
+    IMPORTANCE_MAX_DEPTH, IMPORTANCE_N_ESTIMATORS, IMPORTANCE_SAMPLE_SIZE, feature_importance,
+    iterative_vif_elimination, max_upper_correlation, max_upper_correlation_pandas, to_float32_matrix, vif_scores,
+)
 
 load_model = tf.keras.models.load_model
 
@@ -175,37 +191,61 @@ def get_model_metrics(y_true, y_pred):
     }
 
 
-def get_data_hash(train, test, options=None):
-    """Generate unique hash for data and options"""
-    # hash_obj = hashlib.md5()
-    # hash_obj.update(pd.util.hash_pandas_object(train).values.tobytes())
-    # hash_obj.update(pd.util.hash_pandas_object(test).values.tobytes())
-    # if options:
-    #     hash_obj.update(str(options).encode())
-    # return hash_obj.hexdigest()
-    return "v1"
+# Bump when the structure of anything written under cache/ changes
+CACHE_VERSION = 3
+
+def frame_fingerprint(df):
+    """
+    Content digest of one DataFrame (values, index, column names, dtypes). Computed once when the
+    data is loaded or uploaded and passed around with the frames; recompute after any in-place change.
+    """
+    if df is None:
+        return b"none"
+
+    hash_obj = hashlib.blake2b(digest_size=16)
+    hash_obj.update(repr((df.shape, list(df.columns.astype(str)), list(df.dtypes.astype(str)))).encode())
+    if len(df):
+        # One uint64 per row covering every column; hashed straight from the array buffer
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        hash_obj.update(memoryview(np.ascontiguousarray(row_hashes)))
+    return hash_obj.digest()
+
+
+def get_data_hash(train_fingerprint, test_fingerprint, options=None):
+    """Generate unique hash for data (frame_fingerprint digests) and options"""
+    hash_obj = hashlib.blake2b(digest_size=16)
+    hash_obj.update(f"cache-v{CACHE_VERSION}".encode())
+    hash_obj.update(train_fingerprint)
+    hash_obj.update(test_fingerprint)
+    if options:
+        hash_obj.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return hash_obj.hexdigest()
 
 
 def save_to_cache(data, cache_dir, cache_name):
-    """Save data to cache directory"""
+    """Save data to cache directory; written to a temporary file first so readers never see a partial pickle"""
     os.makedirs(cache_dir, exist_ok=True)
     cache_path = os.path.join(cache_dir, f"{cache_name}.pkl")
-    joblib.dump(data, cache_path)
+    # Per-thread name: sessions and the importance worker may write the same entry at once
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    joblib.dump(data, tmp_path)
+    os.replace(tmp_path, cache_path)
     return cache_path
 
 
-def load_from_cache(cache_dir, cache_name):
-    """Load data from cache if exists"""
+def load_from_cache(cache_dir, cache_name, mmap_mode=None):
+    """Load data from cache if exists; with mmap_mode='r' arrays are read-only maps of the file"""
     cache_path = os.path.join(cache_dir, f"{cache_name}.pkl")
     if os.path.exists(cache_path):
-        return joblib.load(cache_path)
+        return joblib.load(cache_path, mmap_mode=mmap_mode)
     return None
 
 
 def cleanup_old_files(directory, max_files=5):
-    """Keep only the most recent files"""
+    """Keep only the most recent files (subdirectories and in-progress .tmp writes are left alone)"""
     try:
-        files = sorted(glob.glob(os.path.join(directory, "*")),
+        files = sorted((path for path in glob.glob(os.path.join(directory, "*"))
+                        if os.path.isfile(path) and not path.endswith(".tmp")),
                        key=os.path.getmtime, reverse=True)
         for old_file in files[max_files:]:
             os.remove(old_file)
@@ -213,6 +253,47 @@ def cleanup_old_files(directory, max_files=5):
         st.warning(f"Could not clean up old files: {str(e)}")
 
 
+def _rss_mb():
+    """Current resident set size of this process (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_mb():
+    """High-water mark of the process RSS (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def track_memory(stage):
+    """Record RSS before/after a stage and the process peak RSS in st.session_state.memory_report"""
+    before = _rss_mb()
+    try:
+        yield
+    finally:
+        after = _rss_mb()
+        st.session_state.setdefault('memory_report', {})[stage] = {
+            'RSS before (MB)': before,
+            'RSS after (MB)': after,
+            'Change (MB)': after - before if before is not None and after is not None else None,
+            'Process peak RSS (MB)': _peak_rss_mb(),
+        }
+
+
+def show_memory_report():
+    """Per-stage memory usage in the sidebar; the peak is shared by every session in this process"""
+    report = st.session_state.get('memory_report')
+    if report:
+        with st.sidebar.expander("Memory Usage"):
+            st.dataframe(pd.DataFrame.from_dict(report, orient='index').round(1))
+
+
 def show_class_distribution_comparison(y_train, class_weights, encoder):
     """Show side-by-side comparison of original vs weighted distribution"""
     st.subheader("Class Distribution Comparison")
@@ -251,21 +332,68 @@ def show_prediction_samples(y_true, y_pred, encoder, indices=None):
 # ===========================================
 
 
-@st.cache_data
-def load_data(train_path, test_path):
-    """Load data with caching"""
-    cache_dir = "cache/data"
-    cache_name = f"data_{os.path.basename(train_path)}_{os.path.basename(test_path)}"
-    cached_data = load_from_cache(cache_dir, cache_name)
+DATA_STORE_DIR = "cache/data"
+
+
+def downcast_floats(df):
+    """Store float64 columns as float32 (sensor features do not need double precision)"""
+    float_columns = df.select_dtypes(include=["float64"]).columns
+    if len(float_columns):
+        df[float_columns] = df[float_columns].astype(np.float32)
+    return df
+
+
+def _source_signature(path):
+    """(size, mtime_ns) of a source file; a changed CSV gets a new store"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _data_store_path(source_path, signature):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(DATA_STORE_DIR, f"{stem}_{signature[0]}_{signature[1]}.arrow")
+
+
+def _build_data_store(source_path, store_path):
+    """Parse the CSV once and write it as an uncompressed Arrow IPC (Feather v2) file with float32 features"""
+    df = downcast_floats(pd.read_csv(source_path))
 
-    if cached_data:
-        # st.success("Loaded data from stored file!")
-        return cached_data['train'], cached_data['test']
+    os.makedirs(DATA_STORE_DIR, exist_ok=True)
+    tmp_path = f"{store_path}.tmp"
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, store_path)
 
-    train = pd.read_csv(train_path)
-    test = pd.read_csv(test_path)
-    save_to_cache({'train': train, 'test': test}, cache_dir, cache_name)
-    return train, test
+    # Remove stores built from older versions of the same CSV
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    for old_store in glob.glob(os.path.join(DATA_STORE_DIR, f"{stem}_*.arrow")):
+        if old_store != store_path:
+            os.remove(old_store)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_data_store(source_path, signature):
+    """
+    Memory-map the Arrow store; with split_blocks each numeric column is a zero-copy (read-only)
+    view of the mapped file, so only columns that are actually touched are read from disk.
+    Shared across reruns and sessions - callers must not modify the returned frame in place.
+    Returns (frame, frame_fingerprint), so the digest is computed once per store.
+    """
+    store_path = _data_store_path(source_path, signature)
+    if not os.path.exists(store_path):
+        _build_data_store(source_path, store_path)
+    table = feather.read_table(store_path, memory_map=True)
+    df = table.to_pandas(split_blocks=True)
+    return df, frame_fingerprint(df)
+
+
+def load_data(train_path, test_path):
+    """
+    Load data from the columnar store (built from the CSVs on first use).
+    Returns train, test and their (train, test) fingerprints.
+    """
+    train, train_fingerprint = _load_data_store(train_path, _source_signature(train_path))
+    test, test_fingerprint = _load_data_store(test_path, _source_signature(test_path))
+    return train, test, (train_fingerprint, test_fingerprint)
 
 
 # ===========================================
@@ -273,11 +401,11 @@ def load_data(train_path, test_path):
 # ===========================================
 
 
-def perform_eda(train, test):
+def perform_eda(train, test, fingerprints):
     """Perform EDA with robust caching and proper figure handling"""
     cache_dir = "cache/eda"
     os.makedirs(cache_dir, exist_ok=True)
-    cache_name = f"eda_{get_data_hash(train, test)}"
+    cache_name = f"eda_{get_data_hash(*fingerprints)}"
 
     # Initialize default results structure
     eda_results = {
@@ -363,39 +491,28 @@ def perform_eda(train, test):
     if not eda_results['meta']['cached']:
         try:
             save_to_cache(eda_results, cache_dir, cache_name)
+            cleanup_old_files(cache_dir)
         except Exception as e:
             st.warning(f"Could not save to cache: {str(e)}")
 
     with st.expander("Feature Importance Analysis", expanded=False):
-        st.write("""
+        st.write(f"""
         **Top 20 Most Important Features**  
-        Calculated using Random Forest feature importance
+        Calculated using Extra Trees feature importance (max depth {IMPORTANCE_MAX_DEPTH},
+        stratified sample of up to {IMPORTANCE_SAMPLE_SIZE} rows)
         """)
 
         try:
-            # Prepare data
-            X = train.drop(['Activity', 'subject'], axis=1, errors='ignore')
-            y = train['Activity']
-
-            # Handle categorical features if needed
-            if X.select_dtypes(include=['object', 'category']).shape[1] > 0:
-                X = pd.get_dummies(X)
-
-            # Train a quick Random Forest model
-            with st.spinner("Calculating feature importance..."):
-                model = RandomForestClassifier(
-                    n_estimators=100,
-                    random_state=42,
-                    n_jobs=-1
-                )
-                model.fit(X, y)
-
-                # Get feature importance
-                importance = pd.DataFrame({
-                    'Feature': X.columns,
-                    'Importance': model.feature_importances_
-                }).sort_values('Importance', ascending=False)
-
+            # Own subdirectory so importance pickles and EDA results don't evict each other
+            importance_dir = os.path.join(cache_dir, "importance")
+            importance = get_feature_importance(train, fingerprints[0], importance_dir)
+            if importance is None:
+                if hasattr(st, "fragment"):
+                    _wait_for_feature_importance(_importance_cache_name(fingerprints[0]))
+                else:
+                    st.info("Feature importance is being calculated in the background...")
+                    st.button("Refresh", key='refresh_importance')
+            else:
                 # Display top 20 features
                 fig, ax = plt.subplots(figsize=(10, 8))
                 sns.barplot(
@@ -408,40 +525,140 @@ def perform_eda(train, test):
                 ax.set_title('Top 20 Important Features')
                 st.pyplot(fig)
 
-
         except Exception as e:
             st.warning(f"Could not calculate feature importance: {str(e)}")
 
 
+# How often a pending feature-importance job is checked (st.fragment only)
+IMPORTANCE_POLL_SECONDS = 2
+
+
+@st.cache_resource(show_spinner=False)
+def _importance_worker():
+    """
+    One background thread plus its in-flight jobs (cache name -> Future), shared by all sessions.
+    Sessions run in their own threads, so the jobs dict is only touched while holding the lock.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="feature-importance"), {}, threading.Lock()
+
+
+def _importance_cache_name(train_fingerprint):
+    options = {
+        'sample_size': IMPORTANCE_SAMPLE_SIZE,
+        'n_estimators': IMPORTANCE_N_ESTIMATORS,
+        'max_depth': IMPORTANCE_MAX_DEPTH,
+    }
+    return f"importance_{get_data_hash(train_fingerprint, frame_fingerprint(None), options)}"
+
+
+def _importance_job_pending(cache_name):
+    _, jobs, lock = _importance_worker()
+    with lock:
+        future = jobs.get(cache_name)
+    return future is not None and not future.done()
+
+
+def _wait_for_feature_importance(cache_name):
+    """Polled every IMPORTANCE_POLL_SECONDS; reruns the app once the background job has finished"""
+    st.info("Feature importance is being calculated in the background...")
+    if not _importance_job_pending(cache_name):
+        st.rerun()
+
+
+# Fragments (Streamlit >= 1.37) rerun on their own timer without rerunning the whole script
+if hasattr(st, "fragment"):
+    _wait_for_feature_importance = st.fragment(run_every=IMPORTANCE_POLL_SECONDS)(_wait_for_feature_importance)
+
+
+def _feature_importance_job(train, cache_dir, cache_name):
+    # Prepare data
+    X = train.drop(['Activity', 'subject'], axis=1, errors='ignore')
+    y = train['Activity']
+
+    # Handle categorical features if needed
+    if X.select_dtypes(include=['object', 'category']).shape[1] > 0:
+        X = pd.get_dummies(X)
+
+    importance = feature_importance(X, y)
+    save_to_cache(importance, cache_dir, cache_name)
+    return importance
+
+
+def get_feature_importance(train, train_fingerprint, cache_dir):
+    """
+    Importances for this dataset from the EDA cache; on a miss the calculation is started in the
+    background and None is returned so the rest of the EDA tab renders immediately.
+    """
+    cache_name = _importance_cache_name(train_fingerprint)
+    importance = load_from_cache(cache_dir, cache_name)
+    if importance is not None:
+        return importance
+
+    executor, jobs, lock = _importance_worker()
+    with lock:
+        future = jobs.get(cache_name)
+        if future is None:
+            future = jobs[cache_name] = executor.submit(_feature_importance_job, train, cache_dir, cache_name)
+    if not future.done():
+        return None
+
+    # Finished (or failed): drop the job so a failure is retried on the next run
+    with lock:
+        if jobs.get(cache_name) is future:
+            del jobs[cache_name]
+    importance = future.result()
+    cleanup_old_files(cache_dir)
+    return importance
+
+
 # ===========================================
 # Preprocessing
 # ===========================================
 
 
-def remove_highly_correlated_features(train, test, threshold=0.99):
-    """Remove highly correlated features"""
-    corr_matrix = train.corr().abs()
-    upper = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-    to_drop = [column for column in upper.columns if any(upper[column] > threshold)]
+@st.cache_data(max_entries=8, show_spinner=False)
+def _max_upper_correlation(fingerprint, _X):
+    """Per-column max upper-triangle |corr|, cached by dataset fingerprint so any threshold re-prunes instantly"""
+    if _X.isna().to_numpy().any():
+        return max_upper_correlation_pandas(_X)
+    return max_upper_correlation(_X)
+
+
+def remove_highly_correlated_features(train, test, threshold=0.99, fingerprint=None):
+    """
+    Remove every feature whose |corr| with an earlier feature exceeds the threshold.
+    `fingerprint` identifies the feature frame for the correlation cache (computed here if not given).
+    """
+    if fingerprint is None:
+        fingerprint = frame_fingerprint(train)
+    max_corr = _max_upper_correlation(fingerprint.hex(), train)
+    to_drop = train.columns[max_corr > threshold].tolist()
     return train.drop(to_drop, axis=1), test.drop(to_drop, axis=1)
 
 
-def remove_high_vif_features(train, test, threshold=100):
-    """Remove high VIF features"""
-    vif_data = pd.DataFrame()
-    vif_data["Feature"] = train.columns
-    vif_data["VIF"] = [variance_inflation_factor(train.values, i) for i in range(train.shape[1])]
-    high_vif = vif_data[vif_data['VIF'] > threshold]['Feature'].tolist()
+def remove_high_vif_features(train, test, threshold=100, iterative=False):
+    """
+    Remove high VIF features, either all at once or by repeatedly dropping the highest VIF
+    and recomputing (iterative), which usually keeps more features.
+    """
+    if iterative:
+        dropped, vif = iterative_vif_elimination(train, threshold)
+    else:
+        vif = vif_scores(train)
+        dropped = vif > threshold
+    vif_data = pd.DataFrame({"Feature": train.columns, "VIF": vif, "Dropped": dropped})
+    high_vif = train.columns[dropped].tolist()
     return train.drop(high_vif, axis=1), test.drop(high_vif, axis=1), vif_data
 
 
-def preprocess_data(train, test, preprocess_options, force_redo=False):
-    """Preprocess data with caching"""
+def preprocess_data(train, test, preprocess_options, fingerprints, force_redo=False):
+    """Preprocess data with caching; fingerprints are the (train, test) frame_fingerprint digests"""
     cache_dir = "cache/preprocessing"
-    cache_name = f"preprocessed_{get_data_hash(train, test, preprocess_options)}"
+    cache_name = f"preprocessed_{get_data_hash(*fingerprints, preprocess_options)}"
 
     if not force_redo:
-        cached_data = load_from_cache(cache_dir, cache_name)
+        # Memory-mapped: sessions preprocessing the same data share the arrays through the page cache
+        cached_data = load_from_cache(cache_dir, cache_name, mmap_mode="r")
         if cached_data:
             # st.success("Loaded preprocessed data from stored file!")
             # Update session state
@@ -458,7 +675,7 @@ def preprocess_data(train, test, preprocess_options, force_redo=False):
             })
             return cached_data
 
-    with st.spinner("Preprocessing data"):
+    with st.spinner("Preprocessing data"), track_memory("Preprocessing"):
         try:
             # Original preprocessing logic
             le = LabelEncoder()
@@ -470,20 +687,23 @@ def preprocess_data(train, test, preprocess_options, force_redo=False):
 
             # Feature selection
             if preprocess_options.get('remove_high_corr', False):
+                # X_train is train minus the label columns, so the train fingerprint (tagged) identifies it
                 X_train, X_test = remove_highly_correlated_features(
-                    X_train, X_test, preprocess_options.get('corr_threshold', 0.95)
+                    X_train, X_test, preprocess_options.get('corr_threshold', 0.95),
+                    fingerprint=fingerprints[0] + b"features"
                 )
 
             if preprocess_options.get('remove_high_vif', False):
                 X_train, X_test, vif_report = remove_high_vif_features(
-                    X_train, X_test, preprocess_options.get('vif_threshold', 100)
+                    X_train, X_test, preprocess_options.get('vif_threshold', 100),
+                    preprocess_options.get('vif_iterative', False)
                 )
                 st.session_state.vif_report = vif_report
 
-            # Scaling
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
+            # Scaling, in place on float32 copies (the loaded frames are read-only memory maps)
+            scaler = StandardScaler(copy=False)
+            X_train_scaled = scaler.fit_transform(to_float32_matrix(X_train))
+            X_test_scaled = scaler.transform(to_float32_matrix(X_test))
 
             # Compute class weights
             class_weights = compute_class_weight(
@@ -704,12 +924,9 @@ def train_xgboost(X_train, y_train, X_test, y_test, class_weights, model_params=
 
 def train_cnn_lstm(X_train, y_train, X_test, y_test, class_weights, model_params=None):
     """Train CNN-LSTM model"""
-    # Standardize and reshape
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    X_train_3d = X_train_scaled.reshape(X_train.shape[0], X_train.shape[1], 1)
-    X_test_3d = X_test_scaled.reshape(X_test.shape[0], X_test.shape[1], 1)
+    # Inputs are already standardized by preprocess_data; add the channel axis as a view
+    X_train_3d = np.expand_dims(X_train, axis=-1)
+    X_test_3d = np.expand_dims(X_test, axis=-1)
 
     # Build model
     input_shape = (X_train_3d.shape[1], X_train_3d.shape[2])
@@ -921,8 +1138,9 @@ def load_or_train_model(model_name, train_func, X_train, y_train, X_test, y_test
 
     # Create unique model ID based on data and parameters
     model_id = hashlib.md5()
-    model_id.update(X_train.tobytes())
-    model_id.update(y_train.tobytes())
+    # Hash the array buffers directly instead of copying them with tobytes()
+    model_id.update(memoryview(np.ascontiguousarray(X_train)))
+    model_id.update(memoryview(np.ascontiguousarray(y_train)))
     model_id.update(str(model_params).encode())
     model_id = model_id.hexdigest()
     model_version = "v1"
@@ -935,7 +1153,7 @@ def load_or_train_model(model_name, train_func, X_train, y_train, X_test, y_test
             try:
                 model = load_model(model_path)
                 if 'cnn' in model_name.lower():
-                    X_test_reshaped = X_test.reshape(X_test.shape[0], X_test.shape[1], 1)
+                    X_test_reshaped = np.expand_dims(X_test, axis=-1)
                     y_pred = model.predict(X_test_reshaped).argmax(axis=1)
                 else:
                     y_pred = np.argmax(model.predict(X_test), axis=1)
@@ -1037,7 +1255,8 @@ def main():
 
     # Data loading section
     if data_option == "Use sample data":
-        train, test = load_data(train_path, test_path)
+        with track_memory("Data loading"):
+            train, test, fingerprints = load_data(train_path, test_path)
         st.session_state.train = train
         st.session_state.test = test
     else:
@@ -1045,15 +1264,16 @@ def main():
         uploaded_test = st.sidebar.file_uploader("Upload Test Data (CSV) - Optional", type=["csv"])
 
         if not uploaded_train and uploaded_test:
-            test = pd.read_csv(uploaded_test)
+            test = downcast_floats(pd.read_csv(uploaded_test))
             train = test
+            fingerprints = (frame_fingerprint(train),) * 2
             st.session_state.test = test
             st.info("Proceeding to model testing.")
 
         elif uploaded_train:
-            train = pd.read_csv(uploaded_train)
+            train = downcast_floats(pd.read_csv(uploaded_train))
             if uploaded_test:
-                test = pd.read_csv(uploaded_test)
+                test = downcast_floats(pd.read_csv(uploaded_test))
                 st.session_state['test_uploaded'] = True
             else:
                 if st.checkbox("Split training data for validation?"):
@@ -1063,6 +1283,8 @@ def main():
                     #    test = train.copy()
                     test = pd.DataFrame()
                 st.session_state['test_uploaded'] = False
+            # Fingerprint the final (downcast, split) frames once per upload
+            fingerprints = (frame_fingerprint(train), frame_fingerprint(test))
             # Store data in session state
             st.session_state['train'] = train
             st.session_state['test'] = test
@@ -1074,10 +1296,11 @@ def main():
     # Store data in session state
     st.session_state.train = train
     st.session_state.test = test
+    st.session_state.data_fingerprints = fingerprints
 
     # EDA Tab
     with tab1:
-        perform_eda(train, test)
+        perform_eda(train, test, fingerprints)
 
     # Preprocessing Tab
     # In the preprocessing tab (tab2), replace the existing code with:
@@ -1111,6 +1334,9 @@ def main():
             if remove_vif:
                 vif_threshold = st.slider(
                     "VIF Threshold", 50, 200, 100, 5, key="vif_thresh")
+                vif_iterative = st.checkbox(
+                    "Iterative elimination (drop the highest VIF, then recompute)",
+                    value=False, key="vif_iter")
 
         with st.expander("Class Imbalance Handling"):
             handle_imbalance = st.checkbox("Handle Class Imbalance", value=True, key='imb')
@@ -1126,6 +1352,7 @@ def main():
                 'corr_threshold': corr_threshold if remove_corr else None,
                 'remove_high_vif': remove_vif,
                 'vif_threshold': vif_threshold if remove_vif else None,
+                'vif_iterative': vif_iterative if remove_vif else None,
                 'do_scaling': do_scaling
             }
 
@@ -1138,7 +1365,8 @@ def main():
                 preprocessed = preprocess_data(
                     st.session_state.train,
                     st.session_state.test,
-                    preprocess_options
+                    preprocess_options,
+                    st.session_state.data_fingerprints
                     #,
                     # force_redo=force_redo
                 )
@@ -1204,7 +1432,7 @@ def main():
 
                 # Train model button
                 if st.button("Train Model", type="primary", key='train_model'):
-                    with st.spinner(f"Training {model_option}..."):
+                    with st.spinner(f"Training {model_option}..."), track_memory(f"Training: {model_option}"):
                         try:
                             # Get the appropriate training function based on selection
                             model_functions = {
@@ -1368,6 +1596,8 @@ def main():
                                     st.dataframe(pd.DataFrame(report).transpose())
                     else:
                         st.info("Please Train models to see comparison results.")
+
+    show_memory_report()
 st.markdown(
     """
     <style>